@@ -1,9 +1,35 @@
+import csv
+import gzip
+import hashlib
+import hmac
+import io
+import itertools
+import json
+import mimetypes
+import mmap
 import os
-from datetime import datetime
-
+import shutil
+import struct
+import threading
+import time
+import urllib.error
+import urllib.request
+import zipfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from functools import partial
+from html.parser import HTMLParser
+from urllib.parse import quote, urlsplit
+
+import click
 from flask import (
     Flask,
+    abort,
     flash,
+    has_request_context,
+    jsonify,
     redirect,
     render_template,
     request,
@@ -11,8 +37,16 @@ from flask import (
     send_from_directory,
     url_for,
 )
+from flask.templating import Environment
 from flask_sqlalchemy import SQLAlchemy
-from werkzeug.utils import secure_filename
+from jinja2 import FileSystemBytecodeCache, PrefixLoader
+from jinja2.ext import Extension
+from jinja2.lexer import Token
+from markupsafe import Markup
+from sqlalchemy.exc import IntegrityError
+from werkzeug.http import parse_options_header
+from werkzeug.utils import safe_join, secure_filename
+from werkzeug.wsgi import wrap_file
 
 # .env dosyasını yükle
 try:
@@ -43,11 +77,100 @@ app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 app.config["UPLOAD_FOLDER"] = "uploads"
 app.config["DOWNLOAD_FOLDER"] = "downloads"
 app.config["MAX_CONTENT_LENGTH"] = 500 * 1024 * 1024  # 500MB max file size
+# Derlenmiş şablonlar (instance volume'ünde kalıcı, container restart'ında korunur)
+app.config["JINJA_CACHE_DIR"] = os.path.join(os.path.dirname(db_path), "jinja_cache")
 
 # Klasörleri oluştur
 os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
 os.makedirs(app.config["DOWNLOAD_FOLDER"], exist_ok=True)
 os.makedirs(os.path.dirname(db_path), exist_ok=True)
+os.makedirs(app.config["JINJA_CACHE_DIR"], exist_ok=True)
+
+# XPD [File] bağlantılarının yerel kopyaları (pull-through mirror)
+app.config["MIRROR_FOLDER"] = os.environ.get("MIRROR_DIR", "mirror")
+app.config["MIRROR_QUOTA"] = int(os.environ.get("MIRROR_QUOTA_MB", 10240)) * 1024 * 1024
+app.config["MIRROR_CONCURRENCY"] = max(1, int(os.environ.get("MIRROR_CONCURRENCY", 2)))
+# Yansılanacak hostlar (alt alan adları dahil); boş bırakılırsa tüm dış bağlantılar
+app.config["MIRROR_HOSTS"] = [
+    host.strip().lower()
+    for host in os.environ.get("MIRROR_HOSTS", "archive.org").split(",")
+    if host.strip()
+]
+os.makedirs(app.config["MIRROR_FOLDER"], exist_ok=True)
+
+# Portalın sunduğu içerik klasörleri (XPD'ler, CFW, eklentiler, paketler)
+CONTENT_DIRECTORIES = ["cfw", "seplugins", "xpd", "extras"]
+
+# Portalın kendi hostları: bu hostlara işaret eden XPD bağlantıları yerel dosyalardır
+app.config["PORTAL_HOSTS"] = [
+    host.strip().lower()
+    for host in os.environ.get("PORTAL_HOSTS", "psp.myrista.net").split(",")
+    if host.strip()
+]
+
+# Bütünlük taraması (scrub)
+app.config["SCRUB_WORKERS"] = max(1, int(os.environ.get("SCRUB_WORKERS", 2)))
+# Okuma hızı sınırı (MB/sn, 0 = sınırsız)
+app.config["SCRUB_RATE"] = int(float(os.environ.get("SCRUB_RATE_MB", 20)) * 1024 * 1024)
+# Zamanlanmış tarama aralığı (saat, 0 = kapalı)
+app.config["SCRUB_INTERVAL"] = int(
+    float(os.environ.get("SCRUB_INTERVAL_HOURS", 24)) * 3600
+)
+
+# İndirme zamanlayıcısı: büyük dosyalar hız sınırlı ve sıralı, küçükler öncelikli
+# Toplam çıkış hızı (MB/sn, 0 = sınırsız)
+app.config["DOWNLOAD_RATE"] = int(
+    float(os.environ.get("DOWNLOAD_RATE_MB", 0)) * 1024 * 1024
+)
+# İstemci başına hız (KB/sn, 0 = sınırsız)
+app.config["DOWNLOAD_CLIENT_RATE"] = int(
+    float(os.environ.get("DOWNLOAD_CLIENT_RATE_KB", 0)) * 1024
+)
+# Aynı anda gönderilen büyük dosya sayısı; fazlası sıraya girer
+app.config["DOWNLOAD_MAX_LARGE"] = max(1, int(os.environ.get("DOWNLOAD_MAX_LARGE", 4)))
+# Bu boyutun altındaki yanıtlar (XPD, ikon, sayfa) beklemeden gönderilir
+app.config["DOWNLOAD_SMALL_SIZE"] = (
+    int(os.environ.get("DOWNLOAD_SMALL_KB", 1024)) * 1024
+)
+
+# Metin yanıtlarının (sayfa, RSS, XPD, JSON) gzip seviyesi (1-9, 0 = kapalı)
+app.config["COMPRESS_LEVEL"] = int(os.environ.get("COMPRESS_LEVEL", 6))
+
+# Sayfa düzeni: 'frames' (header/main/footer çerçeveleri) ya da 'single' (tek yanıt)
+LAYOUTS = ("frames", "single")
+app.config["DEFAULT_LAYOUT"] = os.environ.get("DEFAULT_LAYOUT", "frames")
+
+# Statik site dışa aktarımı (CDN / GitHub Pages)
+app.config["STATIC_EXPORT_FOLDER"] = os.environ.get("STATIC_EXPORT_DIR", "site")
+# Beslemelerde ve XPD manifestlerinde kullanılan mutlak adres
+app.config["STATIC_EXPORT_BASE_URL"] = os.environ.get(
+    "STATIC_EXPORT_BASE_URL", "http://psp.myrista.net"
+).rstrip("/")
+# Dışa aktarılmayan adreslerin (indirme, mirror, admin) sunulduğu Flask sunucusu
+app.config["STATIC_EXPORT_ORIGIN_URL"] = os.environ.get(
+    "STATIC_EXPORT_ORIGIN_URL", app.config["STATIC_EXPORT_BASE_URL"]
+).rstrip("/")
+
+# Arka plan işleri: aynı anda çalışabilecek iş sayısı (sunucu thread'lerini aç bırakmamak için düşük tutun)
+app.config["JOB_WORKERS"] = max(1, int(os.environ.get("JOB_WORKERS", 1)))
+
+# Yüklenen dosyaların deposu: 'local' (downloads klasörü), 'shared' (tüm kopyaların
+# bağladığı ortak klasör, ör. NFS) ya da 's3' (S3 uyumlu nesne deposu: MinIO, Ceph, AWS)
+app.config["STORAGE_BACKEND"] = os.environ.get("STORAGE_BACKEND", "local")
+app.config["STORAGE_SHARED_DIR"] = os.environ.get("STORAGE_SHARED_DIR", "shared")
+app.config["S3_ENDPOINT"] = os.environ.get("S3_ENDPOINT", "http://localhost:9000")
+app.config["S3_BUCKET"] = os.environ.get("S3_BUCKET", "psp-portal")
+app.config["S3_REGION"] = os.environ.get("S3_REGION", "us-east-1")
+app.config["S3_ACCESS_KEY"] = os.environ.get("S3_ACCESS_KEY", "")
+app.config["S3_SECRET_KEY"] = os.environ.get("S3_SECRET_KEY", "")
+app.config["S3_PREFIX"] = os.environ.get("S3_PREFIX", "")
+# Uzak depodan okunan dosyaların düğüm üzerindeki önbelleği (LRU)
+app.config["STORAGE_CACHE_FOLDER"] = os.environ.get("STORAGE_CACHE_DIR", "cache")
+# Uzak depodaki dosya bilgisinin (boyut/sürüm) ne kadar süre yeniden sorulmayacağı (saniye)
+app.config["STORAGE_STAT_TTL"] = float(os.environ.get("STORAGE_STAT_TTL", 30))
+app.config["STORAGE_CACHE_QUOTA"] = (
+    int(os.environ.get("STORAGE_CACHE_MB", 2048)) * 1024 * 1024
+)
 
 db = SQLAlchemy(app)
 
@@ -89,6 +212,11 @@ TRANSLATIONS = {
         "firmware_type": "Yazılım Türü",
         "custom_firmware": "Kırık Yazılım",
         "original_firmware": "Orijinal Yazılım",
+        "jobs": "Arka Plan İşleri",
+        "job_started": "İş kuyruğa alındı",
+        "job_already_running": "Aynı türde bir iş zaten çalışıyor",
+        "job_cancel_requested": "İptal isteği gönderildi",
+        "batch_entries": "Toplu İşlem",
     },
     "en": {
         "title": "PSP Portal",
@@ -126,6 +254,11 @@ TRANSLATIONS = {
         "firmware_type": "Firmware Type",
         "custom_firmware": "Custom Firmware",
         "original_firmware": "Original Firmware",
+        "jobs": "Background Jobs",
+        "job_started": "Job queued",
+        "job_already_running": "A job of the same kind is already running",
+        "job_cancel_requested": "Cancellation requested",
+        "batch_entries": "Batch Edit",
     },
 }
 
@@ -164,6 +297,97 @@ class Entry(db.Model):
     )
 
 
+class MirrorObject(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    url = db.Column(db.String(1000), nullable=False, unique=True)
+    local_name = db.Column(db.String(200), nullable=False)
+    size = db.Column(db.BigInteger, default=0)
+    # 'pending', 'fetching', 'ready' ya da 'failed'
+    status = db.Column(db.String(20), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, default=0)
+    error = db.Column(db.String(500))
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    fetched_at = db.Column(db.DateTime)
+    last_access = db.Column(db.DateTime, default=datetime.utcnow)
+
+    @property
+    def filename(self):
+        return os.path.basename(urlsplit(self.url).path) or "file"
+
+    @property
+    def local_path(self):
+        return os.path.join(app.config["MIRROR_FOLDER"], self.local_name)
+
+
+class EntryTombstone(db.Model):
+    """Silinen entry'ler; katalog API'sinin delta akışı için tutulur"""
+
+    id = db.Column(db.Integer, primary_key=True)
+    entry_id = db.Column(db.Integer, nullable=False, index=True)
+    category_id = db.Column(db.Integer)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+class FileChecksum(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    path = db.Column(db.String(500), nullable=False, unique=True)
+    size = db.Column(db.BigInteger, nullable=False)
+    mtime = db.Column(db.Float, nullable=False)
+    sha256 = db.Column(db.String(64), nullable=False)
+    checked_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class ScrubFinding(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    path = db.Column(db.String(500), nullable=False)
+    # 'size_mismatch', 'missing', 'corrupt' ya da 'unreadable'
+    kind = db.Column(db.String(20), nullable=False)
+    detail = db.Column(db.String(500))
+    source = db.Column(db.String(500))  # İddiayı yapan XPD ya da entry
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class Job(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.JSON)
+    # 'queued', 'running', 'done', 'failed' ya da 'cancelled'
+    status = db.Column(db.String(20), nullable=False, default="queued")
+    progress = db.Column(db.Integer, default=0)
+    total = db.Column(db.Integer, default=0)
+    message = db.Column(db.String(200))
+    result = db.Column(db.Text)
+    cancel_requested = db.Column(db.Boolean, default=False)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    @property
+    def is_active(self):
+        return self.status in ("queued", "running")
+
+    @property
+    def percent(self):
+        if not self.total:
+            return 100 if self.status == "done" else 0
+        return min(100, int(self.progress * 100 / self.total))
+
+    def report_progress(self, done, total=None, message=None):
+        """İlerlemeyi kaydet; iptal istenmişse işi durdur"""
+        self.progress = done
+        if total is not None:
+            self.total = total
+        if message is not None:
+            self.message = message[:200]
+        db.session.commit()
+
+        # commit sonrası alanlar veritabanından yeniden okunur
+        if self.cancel_requested:
+            raise JobCancelled()
+
+
 def get_translation(lang, key):
     return TRANSLATIONS.get(lang, TRANSLATIONS["tr"]).get(key, key)
 
@@ -183,10 +407,256 @@ def get_localized_icon(base_icon, lang):
     return base_icon
 
 
+# Şablon derleme: her dil için ayrı derlenmiş şablon
+SUPPORTED_LANGUAGES = ("tr", "en")
+DEFAULT_LANGUAGE = "tr"
+
+# Çeviriler değiştiğinde eski bytecode'u geçersiz kılmak için
+TRANSLATIONS_FINGERPRINT = repr(
+    sorted((lang, sorted(table.items())) for lang, table in TRANSLATIONS.items())
+)
+
+
+def template_language(name):
+    """'tr:main.html' gibi şablon adından dili döndür"""
+    if name and ":" in name:
+        lang = name.split(":", 1)[0]
+        if lang in SUPPORTED_LANGUAGES:
+            return lang
+    return None
+
+
+class PrecompiledTranslationExtension(Extension):
+    """Sabit anahtarlı t('...') çağrılarını derleme anında çeviriyle değiştirir"""
+
+    def filter_stream(self, stream):
+        lang = template_language(stream.name)
+        tokens = list(stream)
+        if lang is None:
+            return tokens
+
+        result = []
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            window = tokens[i : i + 4]
+            if (
+                len(window) == 4
+                and token.type == "name"
+                and token.value == "t"
+                and window[1].type == "lparen"
+                and window[2].type == "string"
+                and window[3].type == "rparen"
+                and not (result and result[-1].type == "dot")
+            ):
+                value = get_translation(lang, window[2].value)
+                result.append(Token(token.lineno, "string", value))
+                i += 4
+                continue
+            result.append(token)
+            i += 1
+        return result
+
+
+class TranslationAwareBytecodeCache(FileSystemBytecodeCache):
+    """Çeviriler de checksum'a dahil edilen kalıcı bytecode cache"""
+
+    def get_source_checksum(self, source):
+        return super().get_source_checksum(source + TRANSLATIONS_FINGERPRINT)
+
+
+class LocalizedEnvironment(Environment):
+    """Şablonları 'dil:ad' anahtarıyla yükleyip dil başına ayrı derleyen ortam"""
+
+    def __init__(self, app, **options):
+        options["extensions"] = [
+            *options.get("extensions", ()),
+            PrecompiledTranslationExtension,
+        ]
+        loader = app.create_global_jinja_loader()
+        options["loader"] = PrefixLoader(
+            dict.fromkeys(SUPPORTED_LANGUAGES, loader), delimiter=":"
+        )
+        super().__init__(app, **options)
+        self.bytecode_cache = TranslationAwareBytecodeCache(
+            app.config["JINJA_CACHE_DIR"]
+        )
+
+    def localize_name(self, name, parent=None):
+        if not isinstance(name, str) or template_language(name):
+            return name
+        # extends/include: üst şablonun dilini koru
+        lang = template_language(parent)
+        if lang is None and has_request_context():
+            lang = getattr(request, "lang", DEFAULT_LANGUAGE)
+        return f"{lang or DEFAULT_LANGUAGE}:{name}"
+
+    def get_template(self, name, parent=None, globals=None):
+        return super().get_template(self.localize_name(name, parent), parent, globals)
+
+    def select_template(self, names, parent=None, globals=None):
+        names = [self.localize_name(name, parent) for name in names]
+        return super().select_template(names, parent, globals)
+
+
+app.jinja_environment = LocalizedEnvironment
+
+# Template'lere enjekte edilen global değişkenler (dil başına bir kez oluşturulur)
+TEMPLATE_GLOBALS = {
+    lang: {
+        "colors": COLOR_PALETTE,
+        "t": partial(get_translation, lang),
+        "lang": lang,
+        "get_localized_icon": partial(get_localized_icon, lang=lang),
+    }
+    for lang in SUPPORTED_LANGUAGES
+}
+
+
+# Arka plan işleri
+JOB_HANDLERS = {}
+
+
+class JobCancelled(Exception):
+    """Çalışan iş iptal edildiğinde fırlatılır"""
+
+
+def job_handler(kind):
+    """Fonksiyonu belirtilen iş türünün işleyicisi olarak kaydet"""
+
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+
+    return decorator
+
+
+class JobRunner:
+    """İşleri Job tablosuna yazıp sınırlı bir thread havuzunda çalıştırır"""
+
+    def __init__(self, app):
+        self.app = app
+        self._executor = None
+        self.schedules = {}
+        self._scheduler = None
+
+    @property
+    def executor(self):
+        # Havuz ilk iş geldiğinde oluşturulur (debug reloader'ın ana sürecinde boşuna açılmasın)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.app.config["JOB_WORKERS"],
+                thread_name_prefix="psp-job",
+            )
+        return self._executor
+
+    def submit(self, kind, **payload):
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Bilinmeyen iş türü: {kind}")
+
+        job = Job(kind=kind, payload=payload)
+        db.session.add(job)
+        db.session.commit()
+
+        self.executor.submit(self._run, job.id)
+        return job
+
+    def schedule(self, kind, interval):
+        """İşi her interval saniyede bir kuyruğa al (0 = kapalı)"""
+        if interval > 0:
+            self.schedules[kind] = interval
+
+    def start_scheduler(self):
+        if self._scheduler is not None or not self.schedules:
+            return
+        self._scheduler = threading.Thread(
+            target=self._schedule_loop, name="psp-job-scheduler", daemon=True
+        )
+        self._scheduler.start()
+
+    def _schedule_loop(self):
+        while True:
+            with self.app.app_context():
+                try:
+                    self._schedule_pass()
+                except Exception as e:
+                    # Geçici hatalar (ör. "database is locked") zamanlayıcıyı durdurmasın
+                    db.session.rollback()
+                    print(f"Job scheduler error: {e}")
+                finally:
+                    db.session.remove()
+            time.sleep(60)
+
+    def _schedule_pass(self):
+        for kind, interval in self.schedules.items():
+            # Son çalışma zamanı veritabanından okunur, yeniden başlatmada korunur
+            last = Job.query.filter_by(kind=kind).order_by(Job.id.desc()).first()
+            due = last is None or (
+                (datetime.utcnow() - last.created_at).total_seconds() >= interval
+            )
+            if due and not active_job(kind):
+                self.submit(kind)
+
+    def cancel(self, job):
+        if job.status == "queued":
+            job.status = "cancelled"
+            job.finished_at = datetime.utcnow()
+        elif job.status == "running":
+            job.cancel_requested = True
+        db.session.commit()
+
+    def _run(self, job_id):
+        with self.app.app_context():
+            job = db.session.get(Job, job_id)
+            if job is None or job.status != "queued":
+                return
+
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+            db.session.commit()
+
+            try:
+                result = JOB_HANDLERS[job.kind](job, **(job.payload or {}))
+                job.status = "done"
+                job.result = result
+                job.progress = job.total
+            except JobCancelled:
+                db.session.rollback()
+                job.status = "cancelled"
+            except Exception as e:
+                db.session.rollback()
+                job.status = "failed"
+                job.result = str(e)
+                print(f"Job {job.kind} #{job.id} error: {e}")
+
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+
+
+job_runner = JobRunner(app)
+
+
+def active_job(kind):
+    """Belirtilen türde kuyrukta ya da çalışmakta olan işi döndür"""
+    return Job.query.filter(
+        Job.kind == kind, Job.status.in_(["queued", "running"])
+    ).first()
+
+
 def init_db():
     """Veritabanını başlat ve örnek veriler ekle"""
     db.create_all()
 
+    # Önceki süreçten yarım kalan işleri kapat
+    Job.query.filter(Job.status.in_(["queued", "running"])).update(
+        {"status": "failed", "result": "Sunucu yeniden başlatıldı"},
+        synchronize_session=False,
+    )
+    MirrorObject.query.filter_by(status="fetching").update(
+        {"status": "pending"}, synchronize_session=False
+    )
+    db.session.commit()
+
     if Category.query.count() == 0:
         # Kategorileri oluştur
         categories = [
@@ -257,27 +727,73 @@ def init_db():
 def before_request():
     # Dil seçimi
     if "lang" not in request.args and "lang" not in request.cookies:
-        lang = "tr"  # Varsayılan Türkçe
+        lang = DEFAULT_LANGUAGE  # Varsayılan Türkçe
     else:
-        lang = request.args.get("lang", request.cookies.get("lang", "tr"))
+        lang = request.args.get("lang", request.cookies.get("lang", DEFAULT_LANGUAGE))
+
+    request.lang = lang if lang in SUPPORTED_LANGUAGES else DEFAULT_LANGUAGE
+
+    # Düzen seçimi (dil ile aynı şekilde: parametre, çerez, varsayılan)
+    layout = request.args.get(
+        "layout", request.cookies.get("layout", app.config["DEFAULT_LAYOUT"])
+    )
+    request.layout = layout if layout in LAYOUTS else "frames"
+
+
+@app.before_request
+def start_job_scheduler():
+    # Zamanlayıcı yalnızca istek karşılayan süreçte başlatılır
+    job_runner.start_scheduler()
+
+
+# İstekten bağımsız sayfa parçaları: (ad, dil) -> (anahtar, Markup)
+FRAGMENT_CACHE = {}
 
-    request.lang = lang if lang in ["tr", "en"] else "tr"
+
+def render_fragment(name, lang, key=None, **context):
+    """templates/fragments/<ad>.html'i dil başına bir kez render edip önbellekten döndür
+
+    key değişirse (örn. kategori listesi) ya da şablon dosyası değişirse (auto_reload
+    açıkken Jinja yeni bir Template nesnesi döndürür) parça yeniden render edilir.
+    """
+    template = app.jinja_env.get_template(f"{lang}:fragments/{name}.html")
+    cached = FRAGMENT_CACHE.get((name, lang))
+    if cached is None or cached[0] != key or cached[1] is not template:
+        html = Markup(template.render(TEMPLATE_GLOBALS[lang], **context))
+        cached = (key, template, html)
+        FRAGMENT_CACHE[(name, lang)] = cached
+    return cached[2]
 
 
 @app.context_processor
 def inject_globals():
     """Template'lere global değişkenleri enjekte et"""
+    if not has_request_context():
+        return TEMPLATE_GLOBALS[DEFAULT_LANGUAGE]
+    lang = getattr(request, "lang", DEFAULT_LANGUAGE)
+    if getattr(request, "layout", None) != "single":
+        return TEMPLATE_GLOBALS[lang]
+
+    # Tek sayfa düzeni: header ve footer önbellekteki parçalardan eklenir
     return {
-        "colors": COLOR_PALETTE,
-        "t": lambda k: get_translation(request.lang, k),
-        "lang": request.lang,
-        "get_localized_icon": lambda icon: get_localized_icon(icon, request.lang),
+        **TEMPLATE_GLOBALS[lang],
+        "layout_header": render_fragment("header", lang),
+        "layout_footer": render_fragment("footer", lang),
     }
 
 
+def category_menu(categories, lang):
+    """Ana sayfadaki kategori menüsü (kategoriler değişmedikçe önbellekten)"""
+    key = tuple((c.id, c.slug, c.icon) for c in categories)
+    return render_fragment("category_menu", lang, key, categories=categories)
+
+
 # Ana rotalar
 @app.route("/")
 def index():
+    # Tek sayfa düzeninde çerçeveler yerine ana sayfa doğrudan gönderilir
+    if request.layout == "single":
+        return main()
     return render_template("index.html")
 
 
@@ -294,7 +810,9 @@ def footer_frame():
 @app.route("/main")
 def main():
     categories = Category.query.order_by(Category.order_index).all()
-    return render_template("main.html", categories=categories)
+    return render_template(
+        "main.html", category_menu=category_menu(categories, request.lang)
+    )
 
 
 @app.route("/category/<slug>")
@@ -343,16 +861,392 @@ def firmware_detail(psp_model, firmware_type):
     )
 
 
-@app.route("/download/<int:entry_id>")
-def download_file(entry_id):
-    import glob
+# RSS beslemelerinde en fazla kaç entry listelenir
+FEED_ITEM_LIMIT = 50
 
-    entry = Entry.query.get_or_404(entry_id)
+
+def feed_items(category):
+    """Beslemede listelenecek (entry, mimetype) çiftleri, en yeniden eskiye"""
+    entries = (
+        Entry.query.filter_by(category_id=category.id)
+        .order_by(Entry.created_at.desc(), Entry.id.desc())
+        .limit(FEED_ITEM_LIMIT)
+        .all()
+    )
+    return [
+        (entry, mimetypes.guess_type(entry.file_path)[0] or "application/octet-stream")
+        for entry in entries
+    ]
+
+
+@app.route("/feeds/<slug>.xml")
+def category_feed(slug):
+    """PSP RSS kanalı olarak kategori beslemesi"""
+    category = Category.query.filter_by(slug=slug).first_or_404()
+    return app.response_class(
+        render_template("feed.xml", category=category, items=feed_items(category)),
+        mimetype="text/xml",
+    )
+
+
+S3_TIMEOUT = 60  # saniye
+STORAGE_CHUNK_SIZE = 1024 * 1024
+STORAGE_CACHE_GRACE = 60  # saniye; bu süre içinde okunan kopyalar silinmez
+
+
+class LocalStorage:
+    """Yüklenen dosyalar düğümün kendi klasöründe (tek kopyalı kurulum)"""
+
+    remote = False
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, key):
+        path = safe_join(self.root, key)
+        if path is None:
+            raise ValueError(f"Geçersiz dosya adı: {key}")
+        return path
+
+    def location(self, key):
+        return os.path.join(self.root, key)
+
+    def stat(self, key):
+        """(boyut, sürüm) ya da dosya yoksa None"""
+        path = safe_join(self.root, key)
+        if path is None or not os.path.isfile(path):
+            return None
+        stat = os.stat(path)
+        return stat.st_size, f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+    def open(self, key):
+        return open(self.path(key), "rb")
+
+    def save(self, key, fileobj):
+        """Dosyayı geçici adla yazıp yerine taşı; okuyucular yarım dosya görmez"""
+        path = self.path(key)
+        tmp_path = f"{path}.{os.urandom(4).hex()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                shutil.copyfileobj(fileobj, f, STORAGE_CHUNK_SIZE)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def delete(self, key):
+        path = safe_join(self.root, key)
+        if path and os.path.isfile(path):
+            os.remove(path)
+
+    def local_path(self, key):
+        """Doğrudan gönderilebilecek yerel yol; yoksa None"""
+        path = safe_join(self.root, key)
+        return path if path and os.path.isfile(path) else None
+
+
+class StatCache:
+    """Uzak depoların stat sonuçlarını STORAGE_STAT_TTL saniye tutar
+
+    Bu düğümdeki yazma ve silmeler kaydı hemen düşürür; diğer düğümlerin değişiklikleri
+    en geç TTL sonunda görülür. Alt sınıflar __init__ içinde _stats ve _stats_lock oluşturur.
+    """
+
+    def cached_stat(self, key):
+        now = time.monotonic()
+        with self._stats_lock:
+            cached = self._stats.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        info = self.stat(key)
+        with self._stats_lock:
+            self._stats[key] = (now + app.config["STORAGE_STAT_TTL"], info)
+        return info
+
+    def forget(self, key):
+        with self._stats_lock:
+            self._stats.pop(key, None)
+
+
+class SharedDirStorage(StatCache, LocalStorage):
+    """Tüm kopyaların bağladığı ortak klasör (NFS, SMB); okumalar yerel önbellekten"""
+
+    remote = True
+
+    def __init__(self, root):
+        super().__init__(root)
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def save(self, key, fileobj):
+        super().save(key, fileobj)
+        self.forget(key)
+
+    def delete(self, key):
+        super().delete(key)
+        self.forget(key)
+
+    def local_path(self, key):
+        return None
+
+
+class S3Storage(StatCache):
+    """S3 uyumlu nesne deposu; yol tarzı adresler ve SigV4 imzalı istekler"""
+
+    remote = True
+
+    def __init__(self, endpoint, bucket, region, access_key, secret_key, prefix=""):
+        self.endpoint = endpoint.rstrip("/")
+        self.bucket = bucket
+        self.region = region
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.prefix = prefix.strip("/") + "/" if prefix.strip("/") else ""
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def location(self, key):
+        return f"s3://{self.bucket}/{self.prefix}{key}"
+
+    def signing_key(self, day):
+        key = ("AWS4" + self.secret_key).encode("utf-8")
+        for part in (day, self.region, "s3", "aws4_request"):
+            key = hmac.new(key, part.encode("utf-8"), hashlib.sha256).digest()
+        return key
+
+    def request(self, method, key, body=None, headers=None):
+        """İmzalı istek gönder; gövde imzalanmaz (UNSIGNED-PAYLOAD), dosya akış halinde gider"""
+        path = "/" + quote(f"{self.bucket}/{self.prefix}{key}")
+        amz_date = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        signed = {
+            "host": urlsplit(self.endpoint).netloc,
+            "x-amz-content-sha256": "UNSIGNED-PAYLOAD",
+            "x-amz-date": amz_date,
+        }
+        signed_headers = ";".join(sorted(signed))
+        canonical_request = "\n".join(
+            [
+                method,
+                path,
+                "",
+                "".join(f"{name}:{signed[name]}\n" for name in sorted(signed)),
+                signed_headers,
+                "UNSIGNED-PAYLOAD",
+            ]
+        )
+        scope = f"{amz_date[:8]}/{self.region}/s3/aws4_request"
+        string_to_sign = "\n".join(
+            [
+                "AWS4-HMAC-SHA256",
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode("utf-8")).hexdigest(),
+            ]
+        )
+        signature = hmac.new(
+            self.signing_key(amz_date[:8]),
+            string_to_sign.encode("utf-8"),
+            hashlib.sha256,
+        ).hexdigest()
+
+        req = urllib.request.Request(
+            self.endpoint + path, data=body, method=method, headers=headers or {}
+        )
+        for name, value in signed.items():
+            req.add_header(name, value)
+        req.add_header(
+            "Authorization",
+            f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}",
+        )
+        return urllib.request.urlopen(req, timeout=S3_TIMEOUT)
+
+    def stat(self, key):
+        try:
+            with self.request("HEAD", key) as response:
+                size = int(response.headers["Content-Length"])
+                return size, response.headers.get("ETag", "").strip('"')
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+
+    def open(self, key):
+        try:
+            return self.request("GET", key)
+        except urllib.error.HTTPError as e:
+            if e.code == 404:
+                raise FileNotFoundError(self.location(key)) from e
+            raise
+
+    def save(self, key, fileobj):
+        # Yüklemeler diskte (SpooledTemporaryFile) durduğu için boyut baştan bilinir
+        size = fileobj.seek(0, os.SEEK_END)
+        fileobj.seek(0)
+        headers = {
+            "Content-Length": str(size),
+            "Content-Type": mimetypes.guess_type(key)[0] or "application/octet-stream",
+        }
+        self.request("PUT", key, body=fileobj, headers=headers).close()
+        self.forget(key)
+
+    def delete(self, key):
+        try:
+            self.request("DELETE", key).close()
+        except urllib.error.HTTPError as e:
+            if e.code != 404:
+                raise
+        self.forget(key)
+
+    def local_path(self, key):
+        return None
+
+
+class StorageCache:
+    """Uzak depodan okunan dosyaların yerel kopyaları; kota aşılınca LRU ile silinir"""
+
+    def __init__(self, root, quota):
+        self.root = root
+        self.quota = quota
+        self.lock = threading.Lock()
+        self.fetching = {}  # önbellek yolu -> kopyalamayı yapan thread'in kilidi
+
+    def fetch(self, storage, key):
+        """Dosyanın yerel kopyasının yolu; depoda yoksa None"""
+        # Sık indirilen dosyalar için her istekte depoya (HEAD/NFS stat) gidilmez
+        info = storage.cached_stat(key)
+        if info is None:
+            return None
+
+        # Sürüm (mtime/ETag) ada katıldığı için değişen dosya yeniden indirilir
+        size, version = info
+        digest = hashlib.sha1(f"{key}\0{version}".encode("utf-8")).hexdigest()
+        path = os.path.join(self.root, digest + os.path.splitext(key)[1].lower())
+
+        with self.lock:
+            lock = self.fetching.setdefault(path, threading.Lock())
+        with lock:
+            if os.path.exists(path):
+                os.utime(path)  # LRU sırası
+                return path
+
+            os.makedirs(self.root, exist_ok=True)
+            part_path = f"{path}.{os.urandom(4).hex()}.part"
+            try:
+                with storage.open(key) as source, open(part_path, "wb") as f:
+                    shutil.copyfileobj(source, f, STORAGE_CHUNK_SIZE)
+                if os.path.getsize(part_path) != size:
+                    raise IOError(f"Eksik kopya: {storage.location(key)}")
+                os.replace(part_path, path)
+            finally:
+                if os.path.exists(part_path):
+                    os.remove(part_path)
+                with self.lock:
+                    self.fetching.pop(path, None)
+
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """Kota aşıldıysa en uzun süredir okunmayan kopyaları sil (kotadan büyük tek dosya kalır)"""
+        files = []
+        with os.scandir(self.root) as items:
+            for item in items:
+                if item.is_file() and not item.name.endswith(".part"):
+                    stat = item.stat()
+                    files.append((stat.st_mtime, stat.st_size, item.path))
+
+        # fetch'in az önce döndürdüğü yollar henüz açılmamış olabilir
+        recent = time.time() - STORAGE_CACHE_GRACE
+        used = sum(size for _, size, _ in files)
+        for mtime, size, path in sorted(files):
+            if used <= self.quota or mtime > recent:
+                break
+            if path == keep:
+                continue
+            try:
+                # Gönderilmekte olan kopyanın açık tanıtıcısı geçerli kalır
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            used -= size
+
+
+def create_storage():
+    """STORAGE_BACKEND ayarına göre depoyu oluştur"""
+    backend = app.config["STORAGE_BACKEND"]
+    if backend == "local":
+        return LocalStorage(app.config["DOWNLOAD_FOLDER"])
+    if backend == "shared":
+        return SharedDirStorage(app.config["STORAGE_SHARED_DIR"])
+    if backend == "s3":
+        return S3Storage(
+            app.config["S3_ENDPOINT"],
+            app.config["S3_BUCKET"],
+            app.config["S3_REGION"],
+            app.config["S3_ACCESS_KEY"],
+            app.config["S3_SECRET_KEY"],
+            app.config["S3_PREFIX"],
+        )
+    raise ValueError(f"Bilinmeyen STORAGE_BACKEND: {backend}")
+
+
+storage = create_storage()
+storage_cache = StorageCache(
+    app.config["STORAGE_CACHE_FOLDER"], app.config["STORAGE_CACHE_QUOTA"]
+)
+
+
+def storage_file(key):
+    """Depodaki dosyanın gönderilebilecek yerel yolu (uzak depolarda önbellekten); yoksa None"""
+    if not storage.remote:
+        return storage.local_path(key)
+    return storage_cache.fetch(storage, key)
+
+
+def entry_file_size(entry):
+    """Entry dosyasının bayt cinsinden boyutu (uzak depoda indirmeden); yoksa None"""
+    file_path = find_entry_file(entry)
+    if file_path:
+        return os.path.getsize(file_path)
+    info = storage.stat(entry.file_path)
+    return info[0] if info else None
+
+
+@app.cli.command("storage-import")
+@click.option(
+    "--source", default=None, help="Kaynak klasör (varsayılan DOWNLOAD_FOLDER)"
+)
+@click.option("--overwrite", is_flag=True, help="Depoda aynı boyutta olanları da yaz")
+def storage_import_command(source, overwrite):
+    """Yerel klasördeki yüklemeleri yapılandırılmış depoya aktar"""
+    source = source or app.config["DOWNLOAD_FOLDER"]
+    copied = skipped = 0
+    for name in sorted(os.listdir(source)):
+        path = os.path.join(source, name)
+        if not os.path.isfile(path):
+            continue
+        info = storage.stat(name)
+        if info and info[0] == os.path.getsize(path) and not overwrite:
+            skipped += 1
+            continue
+
+        with open(path, "rb") as f:
+            storage.save(name, f)
+        click.echo(f"{path} -> {storage.location(name)}")
+        copied += 1
+    click.echo(f"{copied} dosya aktarıldı, {skipped} dosya zaten depoda")
+
+
+def find_entry_file(entry):
+    """Entry dosyasını bilinen klasörlerde ara, bulunamazsa None döndür"""
+    import glob
 
     # Dosyayı bulmak için sırayla farklı konumları dene
     possible_paths = [
-        # 1. Downloads klasöründe (yeni yüklenen dosyalar)
-        os.path.join(app.config["DOWNLOAD_FOLDER"], entry.file_path),
+        # 1. Depoda (yeni yüklenen dosyalar; uzak depolar burada aranmaz)
+        storage.local_path(entry.file_path),
         # 2. CFW klasöründe recursive ara
         *glob.glob(os.path.join("cfw", "**", entry.file_path), recursive=True),
         # 3. OFW klasöründe ara
@@ -363,14 +1257,28 @@ def download_file(entry_id):
         os.path.join("extras", entry.file_path),
         # 6. PDC klasöründe ara
         os.path.join("pdc", entry.file_path),
+        # 7. Demo XPD'lerinde ara
+        os.path.join("xpd", "demo", entry.file_path),
     ]
 
     # İlk bulunan dosyayı kullan
-    file_path = None
     for path in possible_paths:
         if path and os.path.exists(path):
-            file_path = path
-            break
+            return path
+    return None
+
+
+@app.route("/download/<int:entry_id>")
+def download_file(entry_id):
+    entry = Entry.query.get_or_404(entry_id)
+
+    # XPD'ler veritabanından üretilen (önbellekli) manifest olarak gönderilir
+    if entry.file_path.lower().endswith(".xpd"):
+        response = xpd_manifest_response(entry)
+        if response is not None:
+            return response
+
+    file_path = find_entry_file(entry) or storage_file(entry.file_path)
 
     if file_path and os.path.exists(file_path):
         # Games kategorisi için özel download path
@@ -385,11 +1293,426 @@ def download_file(entry_id):
         return redirect(url_for("category_detail", slug=entry.category.slug))
 
 
+class TokenBucket:
+    """Bayt/sn token bucket; ayrılan token'lar bakiyeyi eksiye düşürebilir (0 = sınırsız)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or rate
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def charge(self, amount):
+        """Beklemeden harca (öncelikli yanıtlar sonraki ayırmaları geciktirir)"""
+        if not self.rate:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+
+    def reserve(self, amount):
+        """Token ayır; gönderimden önce beklenmesi gereken süreyi döndür
+
+        Bakiye eksideyken ayırmalar geliş sırasına göre dizilir, böylece aynı kovayı
+        paylaşan aktarımlar parça parça sırayla ilerler.
+        """
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            return max(0.0, -self._tokens / self.rate)
+
+    @property
+    def idle(self):
+        with self._lock:
+            self._refill()
+            return self._tokens >= self.burst
+
+
+class DownloadScheduler:
+    """İndirmeler için adil paylaşımlı bant genişliği zamanlayıcısı
+
+    - Küçük yanıtlar beklemeden gönderilir, yalnızca toplam kovadan düşülür.
+    - Büyük yanıtlar toplam ve istemci kovalarından token ayırarak akar; aynı anda
+      en fazla max_large tanesi gönderilir, diğerleri sıraya girer. Boşalan yer
+      istemciler arasında sırayla (en uzun süredir başlatmamış olana) verilir.
+    """
+
+    def __init__(self, rate, client_rate, max_large, small_size):
+        self.client_rate = client_rate
+        self.max_large = max_large
+        self.small_size = small_size
+        self.bucket = TokenBucket(rate)
+        self._clients = {}  # istemci -> TokenBucket
+        self._active = {}  # istemci -> gönderilen büyük dosya sayısı
+        self._waiting = []  # (sıra, istemci)
+        self._last_start = {}  # istemci -> son başlatılan büyük dosyanın sırası
+        self._tickets = itertools.count()
+        self._cond = threading.Condition()
+
+    def client_bucket(self, client):
+        if not self.client_rate:
+            return None
+        with self._cond:
+            bucket = self._clients.get(client)
+            if bucket is None:
+                # Boşta kalan istemcilerin kovaları atılır
+                for key in [k for k, b in self._clients.items() if b.idle]:
+                    if not self._active.get(key):
+                        del self._clients[key]
+                bucket = self._clients[client] = TokenBucket(self.client_rate)
+            return bucket
+
+    def _next_ticket(self):
+        return min(
+            self._waiting,
+            key=lambda w: (
+                self._active.get(w[1], 0),
+                self._last_start.get(w[1], -1),
+                w[0],
+            ),
+        )[0]
+
+    def acquire(self, client):
+        """Büyük dosya için yer açılana kadar sırada bekle"""
+        with self._cond:
+            ticket = next(self._tickets)
+            self._waiting.append((ticket, client))
+            while (
+                sum(self._active.values()) >= self.max_large
+                or self._next_ticket() != ticket
+            ):
+                self._cond.wait()
+            self._waiting.remove((ticket, client))
+            self._active[client] = self._active.get(client, 0) + 1
+            self._last_start[client] = ticket
+            self._cond.notify_all()
+
+    def release(self, client):
+        with self._cond:
+            self._active[client] -= 1
+            if not self._active[client]:
+                del self._active[client]
+                if all(waiting != client for _, waiting in self._waiting):
+                    self._last_start.pop(client, None)
+            self._cond.notify_all()
+
+    def throttle(self, client, amount):
+        bucket = self.client_bucket(client)
+        delay = self.bucket.reserve(amount)
+        if bucket is not None:
+            delay = max(delay, bucket.reserve(amount))
+        if delay:
+            time.sleep(delay)
+
+    def stats(self):
+        with self._cond:
+            return {"active": sum(self._active.values()), "queued": len(self._waiting)}
+
+
+class ScheduledBody:
+    """Yanıt gövdesini zamanlayıcı üzerinden akıtan WSGI iterable"""
+
+    def __init__(self, scheduler, body, client):
+        self.scheduler = scheduler
+        self.body = body
+        self.client = client
+        self._acquired = False
+
+    def __iter__(self):
+        self.scheduler.acquire(self.client)
+        self._acquired = True
+        for chunk in self.body:
+            self.scheduler.throttle(self.client, len(chunk))
+            yield chunk
+
+    def close(self):
+        if self._acquired:
+            self._acquired = False
+            self.scheduler.release(self.client)
+        if hasattr(self.body, "close"):
+            self.body.close()
+
+
+download_scheduler = DownloadScheduler(
+    app.config["DOWNLOAD_RATE"],
+    app.config["DOWNLOAD_CLIENT_RATE"],
+    app.config["DOWNLOAD_MAX_LARGE"],
+    app.config["DOWNLOAD_SMALL_SIZE"],
+)
+
+
+@app.after_request
+def schedule_download(response):
+    """Büyük dosya yanıtlarını zamanlayıcıya bağla, küçükleri toplam kovadan düş"""
+    size = response.content_length
+    if not size or request.method == "HEAD":
+        return response
+
+    if size < download_scheduler.small_size or not response.direct_passthrough:
+        download_scheduler.bucket.charge(size)
+        return response
+
+    response.response = ScheduledBody(
+        download_scheduler, response.response, request.remote_addr
+    )
+    return response
+
+
+# Yanıt sıkıştırma
+COMPRESS_MIN_SIZE = 512  # Daha küçük yanıtlarda gzip başlığı kazancı siler
+COMPRESS_ETAG_SUFFIX = "-gz"  # Sıkıştırılmış gövde ayrı bir temsil, ETag'i de ayrı
+COMPRESSIBLE_MIMETYPES = {
+    "application/json",
+    "application/xml",
+    "application/rss+xml",
+    "application/javascript",
+    "image/svg+xml",
+}
+# application/octet-stream olarak gönderilen metin dosyaları (XPD manifestleri)
+COMPRESSIBLE_EXTENSIONS = (".xpd", ".html", ".xml", ".json", ".txt")
+
+
+class CompressionCache:
+    """Gövde özeti -> gzip'li gövde; aynı baytlar bir kez sıkıştırılır (boyut sınırlı LRU)"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.items = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def compress(self, body):
+        key = hashlib.sha1(body).digest()
+        with self.lock:
+            compressed = self.items.get(key)
+            if compressed is not None:
+                self.items.move_to_end(key)
+                return compressed
+
+        # mtime=0: aynı içerik her zaman aynı baytlara sıkışır
+        compressed = gzip.compress(body, app.config["COMPRESS_LEVEL"], mtime=0)
+        with self.lock:
+            if key not in self.items:
+                self.items[key] = compressed
+                self.size += len(compressed)
+            while self.size > self.max_bytes and len(self.items) > 1:
+                _, evicted = self.items.popitem(last=False)
+                self.size -= len(evicted)
+        return compressed
+
+
+compression_cache = CompressionCache(16 * 1024 * 1024)
+
+
+def is_compressible(response):
+    """Metin yanıtı mı; dosya gönderimleri (PBP, ZIP, JPG, ISO) akış olarak geçer"""
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or not response.is_sequence
+        or "Content-Encoding" in response.headers
+    ):
+        return False
+
+    mimetype = response.mimetype or ""
+    if mimetype.startswith("text/") or mimetype in COMPRESSIBLE_MIMETYPES:
+        return True
+    disposition = response.headers.get("Content-Disposition")
+    if mimetype == "application/octet-stream" and disposition:
+        filename = parse_options_header(disposition)[1].get("filename", "")
+        return filename.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+    return False
+
+
+@app.after_request
+def compress_response(response):
+    """İstemci gzip kabul ediyorsa metin yanıtlarını önbellekteki sıkıştırılmış haliyle gönder"""
+    if not app.config["COMPRESS_LEVEL"] or not is_compressible(response):
+        return response
+
+    # Aynı adres kodlamaya göre farklı gövde döndürür
+    response.vary.add("Accept-Encoding")
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE or not request.accept_encodings["gzip"]:
+        return response
+
+    response.set_data(compression_cache.compress(body))
+    response.headers["Content-Encoding"] = "gzip"
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + COMPRESS_ETAG_SUFFIX, weak)
+    return response
+
+
+# JSON katalog API'si (homebrew store istemcileri ve diğer portallar için)
+API_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+# updated_at flush anında yazılır; daha erken zamanlı bir satır daha geç commit
+# edilebileceği için delta sorguları bu kadar geriden başlar (istemci tekrarları yok sayar)
+API_CURSOR_OVERLAP = timedelta(seconds=60)
+
+
+def api_json_response(data, etag):
+    """Kısa alan adlı, boşluksuz JSON yanıtı; ETag ile koşullu"""
+    response = app.response_class(
+        json.dumps(data, separators=(",", ":"), ensure_ascii=False),
+        mimetype="application/json",
+    )
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+def api_not_modified(etag):
+    """İstemcideki kopya güncelse gövdeyi hiç üretmeden 304 döndür
+
+    İstemci sıkıştırılmış gövdenin ETag'ini (COMPRESS_ETAG_SUFFIX ekli) de gönderebilir.
+    """
+    for candidate in (etag, etag + COMPRESS_ETAG_SUFFIX):
+        if candidate in request.if_none_match:
+            response = app.response_class(status=304)
+            response.set_etag(candidate)
+            return response
+    return None
+
+
+def compact_entry(entry):
+    data = {
+        "i": entry.id,
+        "c": entry.category_id,
+        "t": entry.title,
+        "d": entry.description or "",
+        "s": entry.file_size or "",
+        "u": entry.updated_at.strftime(API_TIME_FORMAT),
+    }
+    # Boş alanlar gönderilmez
+    if entry.icon_path:
+        data["p"] = entry.icon_path
+    if entry.psp_model:
+        data["m"] = entry.psp_model
+    if entry.firmware_type:
+        data["f"] = entry.firmware_type
+    return data
+
+
+@app.route("/api/v1/categories")
+def api_categories():
+    categories = Category.query.order_by(Category.order_index).all()
+    etag = hashlib.sha1(
+        repr(
+            [(c.id, c.slug, c.icon, c.order_index) for c in categories] + [request.lang]
+        ).encode("utf-8")
+    ).hexdigest()
+
+    not_modified = api_not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    return api_json_response(
+        [
+            {
+                "i": c.id,
+                "s": c.slug,
+                "n": get_translation(request.lang, c.slug),
+                "p": c.icon,
+                "o": c.order_index,
+            }
+            for c in categories
+        ],
+        etag,
+    )
+
+
+@app.route("/api/v1/entries")
+def api_entries():
+    """Entry listesi; since verilirse yalnızca o zamandan sonra değişenler ve silinenler
+
+    İstemci önce "d" (silinen ya da kategoriden çıkan id'ler), sonra "e" (eklenen/
+    güncellenen) listesini uygulamalı ve bir sonraki istekte since olarak "n" değerini
+    göndermelidir. Son API_CURSOR_OVERLAP içindeki değişiklikler tekrar gelebilir.
+    """
+    since = request.args.get("since")
+    if since:
+        try:
+            since = datetime.strptime(since, API_TIME_FORMAT)
+        except ValueError:
+            return app.response_class(
+                json.dumps({"error": f"since biçimi {API_TIME_FORMAT} olmalı"}),
+                status=400,
+                mimetype="application/json",
+            )
+
+    entries = Entry.query
+    tombstones = EntryTombstone.query
+    category_slug = request.args.get("category")
+    if category_slug:
+        category = Category.query.filter_by(slug=category_slug).first_or_404()
+        entries = entries.filter(Entry.category_id == category.id)
+        tombstones = tombstones.filter(EntryTombstone.category_id == category.id)
+    if since:
+        entries = entries.filter(Entry.updated_at > since - API_CURSOR_OVERLAP)
+        tombstones = tombstones.filter(
+            EntryTombstone.deleted_at > since - API_CURSOR_OVERLAP
+        )
+
+    # ETag önce özet sorgusuyla hesaplanır, 304 durumunda liste hiç yüklenmez
+    count, last_update = entries.with_entities(
+        db.func.count(Entry.id), db.func.max(Entry.updated_at)
+    ).one()
+    last_delete = tombstones.with_entities(
+        db.func.max(EntryTombstone.deleted_at)
+    ).scalar()
+    etag = hashlib.sha1(
+        repr((count, last_update, last_delete, request.query_string)).encode("utf-8")
+    ).hexdigest()
+
+    not_modified = api_not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    # Sonraki delta isteği için imleç: görülen en yeni değişiklik zamanı
+    changes = [t for t in (last_update, last_delete, since) if t]
+    cursor = max(changes) if changes else None
+
+    return api_json_response(
+        {
+            "e": [compact_entry(entry) for entry in entries.order_by(Entry.id).all()],
+            "d": [tombstone.entry_id for tombstone in tombstones.all()],
+            "n": cursor.strftime(API_TIME_FORMAT) if cursor else None,
+        },
+        etag,
+    )
+
+
+def move_entry(entry, category_id):
+    """Entry'nin kategorisini değiştir; eski kategoriyi izleyen istemciler için mezar taşı yaz"""
+    if entry.category_id is not None and entry.category_id != category_id:
+        db.session.add(EntryTombstone(entry_id=entry.id, category_id=entry.category_id))
+    entry.category_id = category_id
+
+
 # Admin rotalar
 @app.route("/admin")
 def admin():
     categories = Category.query.order_by(Category.order_index).all()
-    return render_template("admin/index.html", categories=categories)
+    ready, used = (
+        db.session.query(
+            db.func.count(MirrorObject.id),
+            db.func.coalesce(db.func.sum(MirrorObject.size), 0),
+        )
+        .filter(MirrorObject.status == "ready")
+        .one()
+    )
+    mirror_stats = {"ready": ready, "used": used, "quota": app.config["MIRROR_QUOTA"]}
+    return render_template(
+        "admin/index.html", categories=categories, mirror_stats=mirror_stats
+    )
 
 
 @app.route("/admin/entries")
@@ -419,19 +1742,13 @@ def admin_add_entry():
             file = request.files["file"]
             if file and file.filename:
                 filename = secure_filename(file.filename)
-                file_path = os.path.join(app.config["DOWNLOAD_FOLDER"], filename)
-                file.save(file_path)
+                storage.save(filename, file.stream)
 
-                # Dosya boyutunu hesapla
-                file_size = os.path.getsize(file_path)
-                file_size_mb = f"{file_size / (1024 * 1024):.1f}MB"
-
-                # Entry oluştur
+                # Entry oluştur (boyut arka plan işinde hesaplanır)
                 entry = Entry(
                     title=request.form["title"],
                     description=request.form.get("description", ""),
                     file_path=filename,
-                    file_size=file_size_mb,
                     category_id=request.form["category_id"],
                 )
 
@@ -443,6 +1760,7 @@ def admin_add_entry():
 
                 db.session.add(entry)
                 db.session.commit()
+                job_runner.submit("process_upload", entry_id=entry.id)
 
                 flash(get_translation(request.lang, "entry_added"), "success")
                 return redirect(url_for("admin_entries"))
@@ -458,7 +1776,7 @@ def admin_edit_entry(entry_id):
     if request.method == "POST":
         entry.title = request.form["title"]
         entry.description = request.form.get("description", "")
-        entry.category_id = request.form["category_id"]
+        move_entry(entry, int(request.form["category_id"]))
 
         # Firmware kategorisi için özel alanlar
         category = Category.query.get(request.form["category_id"])
@@ -471,26 +1789,25 @@ def admin_edit_entry(entry_id):
             entry.firmware_type = None
 
         # Yeni dosya yüklendiyse
+        new_file_uploaded = False
         if "file" in request.files:
             file = request.files["file"]
             if file and file.filename:
                 # Eski dosyayı sil
-                old_file_path = os.path.join(
-                    app.config["DOWNLOAD_FOLDER"], entry.file_path
-                )
-                if os.path.exists(old_file_path):
-                    os.remove(old_file_path)
+                storage.delete(entry.file_path)
 
                 # Yeni dosyayı kaydet
                 filename = secure_filename(file.filename)
-                file_path = os.path.join(app.config["DOWNLOAD_FOLDER"], filename)
-                file.save(file_path)
+                storage.save(filename, file.stream)
 
                 entry.file_path = filename
-                file_size = os.path.getsize(file_path)
-                entry.file_size = f"{file_size / (1024 * 1024):.1f}MB"
+                entry.file_size = None
+                new_file_uploaded = True
 
         db.session.commit()
+        invalidate_xpd_cache(entry.id)
+        if new_file_uploaded:
+            job_runner.submit("process_upload", entry_id=entry.id)
         flash(get_translation(request.lang, "entry_updated"), "success")
         return redirect(url_for("admin_entries"))
 
@@ -503,291 +1820,732 @@ def admin_delete_entry(entry_id):
     entry = Entry.query.get_or_404(entry_id)
 
     # Dosyayı sil
-    file_path = os.path.join(app.config["DOWNLOAD_FOLDER"], entry.file_path)
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    storage.delete(entry.file_path)
 
     db.session.delete(entry)
+    db.session.add(EntryTombstone(entry_id=entry.id, category_id=entry.category_id))
     db.session.commit()
+    invalidate_xpd_cache(entry_id)
 
     flash(get_translation(request.lang, "entry_deleted"), "success")
     return redirect(url_for("admin_entries"))
 
 
-@app.route("/admin/import-legacy", methods=["POST"])
-def admin_import_legacy():
-    """XPD dosyalarından verileri içe aktar"""
-    try:
-        import_count = 0
-
-        # Firmware kategorisi için CFW ve OFW dosyalarını XPD'lerden al
-        firmware_category = Category.query.filter_by(slug="firmware").first()
-        if firmware_category:
-            # CFW klasöründeki XPD dosyalarını işle
-            import_count += import_from_xpd_directory(
-                "cfw", firmware_category.id, "CFW"
-            )
+# Toplu entry işlemleri: satır başına op (create/update/delete), id ve değişen alanlar
+BATCH_FIELDS = (
+    "op",
+    "id",
+    "title",
+    "description",
+    "category",
+    "file",
+    "psp_model",
+    "firmware_type",
+)
+BATCH_MAX_ROWS = 5000
+
+
+class EntryBatch:
+    """Satırları doğrula ve tek transaction'da uygula; dosyalar yalnızca commit sonrası değişir"""
+
+    def __init__(self, rows, uploads):
+        self.rows = rows
+        self.uploads = uploads  # depo anahtarı -> yüklenen dosya
+        self.categories = {}
+        for category in Category.query.all():
+            self.categories[category.slug] = category
+            self.categories[str(category.id)] = category
 
-            # OFW klasöründeki XPD dosyalarını işle (xpd/ofw altında)
-            import_count += import_from_xpd_directory(
-                "xpd/ofw", firmware_category.id, "OFW"
+        ids = [str(row.get("id") or "").strip() for row in rows]
+        self.entries = {
+            str(entry.id): entry
+            for entry in Entry.query.filter(
+                Entry.id.in_([int(i) for i in ids if i.isdigit()])
             )
+        }
+        self.seen = set()
+        self.created = []  # (sonuç, entry); id'ler flush sonrası yazılır
+        self.new_files = {}  # depo anahtarı -> [(sonuç, entry, önceki dosya)]
+        self.old_files = set()  # commit sonrası silinecek anahtarlar
+        self.processed = []  # boyutu yeniden hesaplanacak entry'ler
+        self.changed = set()
+
+    @staticmethod
+    def value(row, name):
+        """Alan değeri; boş hücreler (CSV) ve eksik alanlar None"""
+        value = row.get(name)
+        if value is None:
+            return None
+        value = str(value).strip()
+        return value or None
+
+    def run(self, dry_run=False):
+        """(uygulandı mı, satır sonuçları) döndür; hatalı satır varsa hiçbiri uygulanmaz"""
+        results = []
+        for index, row in enumerate(self.rows, 1):
+            result = {"row": index, "op": self.value(row, "op")}
+            try:
+                self.apply(row, result)
+                result["status"] = "ok"
+            except ValueError as e:
+                result["status"] = "error"
+                result["error"] = str(e)
+            results.append(result)
+
+        if dry_run or any(result["status"] == "error" for result in results):
+            db.session.rollback()
+            return False, results
+
+        db.session.flush()
+        for result, entry in self.created:
+            result["id"] = entry.id
+        db.session.commit()
+        self.finish()
+        return True, results
+
+    def apply(self, row, result):
+        op = (result["op"] or "").lower()
+        if op == "create":
+            entry = Entry()
+            self.set_fields(entry, row, result, create=True)
+            db.session.add(entry)
+            self.created.append((result, entry))
+            self.processed.append(entry)
+            return
+
+        if op not in ("update", "delete"):
+            raise ValueError(f"Geçersiz işlem: {op or '-'}")
+
+        entry_id = self.value(row, "id")
+        entry = self.entries.get(entry_id or "")
+        if entry is None:
+            raise ValueError(f"Giriş bulunamadı: {entry_id or '-'}")
+        if entry_id in self.seen:
+            raise ValueError(f"Giriş #{entry_id} birden fazla satırda")
+        self.seen.add(entry_id)
+        result["id"] = entry.id
+        self.changed.add(entry.id)
+
+        if op == "delete":
+            self.old_files.add(entry.file_path)
+            db.session.delete(entry)
+            db.session.add(
+                EntryTombstone(entry_id=entry.id, category_id=entry.category_id)
+            )
+        else:
+            self.set_fields(entry, row, result)
+
+    def set_fields(self, entry, row, result, create=False):
+        """Verilen alanları yaz; güncellemede boş alanlar değişmez"""
+        title = self.value(row, "title")
+        if title:
+            entry.title = title[:200]
+        elif create:
+            raise ValueError("Başlık gerekli")
+
+        description = self.value(row, "description")
+        if description is not None:
+            entry.description = description
+
+        category_key = self.value(row, "category")
+        if category_key:
+            category = self.categories.get(category_key)
+            if category is None:
+                raise ValueError(f"Kategori bulunamadı: {category_key}")
+            move_entry(entry, category.id)
+        elif create:
+            raise ValueError("Kategori gerekli")
+        else:
+            category = self.categories[str(entry.category_id)]
+
+        # Firmware kategorisi için özel alanlar (tek girişli formlardaki gibi)
+        if category.slug == "firmware":
+            psp_model = self.value(row, "psp_model") or entry.psp_model
+            firmware_type = self.value(row, "firmware_type") or entry.firmware_type
+            if psp_model not in FIRMWARE_MODELS:
+                raise ValueError(f"Geçersiz PSP modeli: {psp_model or '-'}")
+            if firmware_type not in FIRMWARE_TYPES:
+                raise ValueError(f"Geçersiz yazılım türü: {firmware_type or '-'}")
+            entry.psp_model = psp_model
+            entry.firmware_type = firmware_type
+        else:
+            entry.psp_model = None
+            entry.firmware_type = None
 
-        # Demos kategorisi için PDC'den veri al (eski sistem)
-        demos_category = Category.query.filter_by(slug="demos").first()
-        if demos_category:
-            pdc_file = os.path.join("pdc", "main.html")
-            if os.path.exists(pdc_file):
-                import_count += import_from_pdc_html(pdc_file, demos_category.id)
-
-        # Plugins kategorisi için seplugins'den veri al (eski sistem)
-        plugins_category = Category.query.filter_by(slug="plugins").first()
-        if plugins_category:
-            plugins_file = os.path.join("seplugins", "main.html")
-            if os.path.exists(plugins_file):
-                import_count += import_from_plugins_html(
-                    plugins_file, plugins_category.id
+        file_name = self.value(row, "file")
+        if file_name:
+            # İstekle yüklenen dosya ya da depoda/içerik klasörlerinde olan bir dosya
+            key = secure_filename(file_name)
+            if key in self.uploads:
+                previous = None if create else entry.file_path
+                self.new_files.setdefault(key, []).append((result, entry, previous))
+            elif (
+                storage.stat(key) is None
+                and find_entry_file(Entry(file_path=key)) is None
+            ):
+                raise ValueError(f"Dosya bulunamadı: {file_name}")
+
+            replaced = key != entry.file_path
+            if replaced and entry.file_path:
+                self.old_files.add(entry.file_path)
+            if replaced or key in self.uploads:
+                entry.file_path = key
+                entry.file_size = None
+                if not create:
+                    self.processed.append(entry)
+        elif create:
+            raise ValueError("Dosya gerekli")
+
+    def finish(self):
+        """Commit sonrası: yeni dosyaları depoya yaz, artık kullanılmayanları sil
+
+        Dosyası yazılamayan güncellemeler önceki dosyalarına döner; yeni oluşturulan
+        entry'ler eksik dosyayı göstermeye devam eder ve satırları file_error olur.
+        """
+        reverted = False
+        for key, users in self.new_files.items():
+            try:
+                upload = self.uploads[key]
+                upload.stream.seek(0)
+                storage.save(key, upload.stream)
+            except (OSError, urllib.error.URLError) as e:
+                for result, entry, previous in users:
+                    result["status"] = "file_error"
+                    result["error"] = f"Dosya kaydedilemedi: {e}"
+                    if previous:
+                        entry.file_path = previous
+                        self.old_files.discard(previous)
+                        reverted = True
+        if reverted:
+            db.session.commit()
+
+        # Başka bir entry'nin hâlâ kullandığı dosyalar silinmez
+        stale = self.old_files - set(self.new_files)
+        if stale:
+            in_use = {
+                path
+                for (path,) in db.session.query(Entry.file_path).filter(
+                    Entry.file_path.in_(stale)
                 )
+            }
+            for key in stale - in_use:
+                # Silinemeyen dosya yalnızca yer kaplar; toplu işlem zaten uygulandı
+                try:
+                    storage.delete(key)
+                except (OSError, urllib.error.URLError) as e:
+                    print(f"Batch file delete error for {key}: {e}")
+
+        for entry_id in self.changed:
+            invalidate_xpd_cache(entry_id)
+        if self.processed:
+            job_runner.submit(
+                "process_uploads", entry_ids=[entry.id for entry in self.processed]
+            )
 
-        # Extras kategorisi için extras'dan veri al (eski sistem)
-        extras_category = Category.query.filter_by(slug="extras").first()
-        if extras_category:
-            extras_file = os.path.join("extras", "main.html")
-            if os.path.exists(extras_file):
-                import_count += import_from_extras_html(extras_file, extras_category.id)
 
-        db.session.commit()
-        flash(
-            f"{get_translation(request.lang, 'import_success')} ({import_count} giriş)",
-            "success",
-        )
+def batch_rows():
+    """Satırları JSON gövdesinden, 'rows' form alanından ya da 'csv' dosyasından oku"""
+    if request.is_json:
+        data = request.get_json(silent=True)
+    elif request.form.get("rows"):
+        try:
+            data = json.loads(request.form["rows"])
+        except ValueError:
+            raise ValueError("'rows' geçerli JSON değil")
+    elif request.files.get("csv"):
+        stream = io.TextIOWrapper(request.files["csv"].stream, encoding="utf-8-sig")
+        data = list(csv.DictReader(stream))
+    else:
+        raise ValueError("JSON gövdesi, 'rows' alanı ya da 'csv' dosyası gerekli")
 
-    except Exception as e:
-        db.session.rollback()
-        flash(f"Import hatası: {str(e)}", "error")
+    rows = data.get("rows") if isinstance(data, dict) else data
+    if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+        raise ValueError("Satırlar nesne listesi olmalı")
+    if not rows or len(rows) > BATCH_MAX_ROWS:
+        raise ValueError(f"1-{BATCH_MAX_ROWS} satır gönderilmeli")
+    return rows
 
-    return redirect(url_for("admin"))
 
+@app.route("/admin/entries/batch", methods=["GET", "POST"])
+def admin_batch_entries():
+    """Toplu oluşturma/güncelleme/silme; JSON ya da CSV, istenirse dosyalarla birlikte"""
+    if request.method == "GET":
+        return render_template("admin/batch.html", fields=BATCH_FIELDS)
 
-def import_from_cfw_html(file_path, category_id):
-    """CFW HTML dosyasından verileri içe aktar"""
-    count = 0
+    html = request.form.get("format") == "html"
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            import re
-
-            downloads = re.findall(r'<a href="([^"]+\.xpd)"[^>]*>([^<]+)</a>', content)
-            for download_url, title in downloads:
-                existing = Entry.query.filter_by(title=title.strip()).first()
-                if not existing:
-                    # PSP modelini tespit et
-                    psp_model = (
-                        "pspgo"
-                        if "go" in title.lower() or "psp-go" in title.lower()
-                        else "psp"
-                    )
+        rows = batch_rows()
+    except ValueError as e:
+        if html:
+            flash(str(e), "error")
+            return redirect(url_for("admin_batch_entries"))
+        return jsonify({"error": str(e)}), 400
+
+    uploads = {
+        secure_filename(upload.filename): upload
+        for upload in request.files.getlist("files")
+        if upload.filename
+    }
+    dry_run = request.values.get("dry_run", "").lower() in ("1", "true", "on")
+    applied, results = EntryBatch(rows, uploads).run(dry_run=dry_run)
+
+    if html:
+        return render_template(
+            "admin/batch.html",
+            fields=BATCH_FIELDS,
+            applied=applied,
+            dry_run=dry_run,
+            results=results,
+        )
+    statuses = {result["status"] for result in results}
+    if "error" in statuses:
+        status_code = 422
+    elif "file_error" in statuses:
+        # Satırlar uygulandı ama bazı dosyalar depoya yazılamadı
+        status_code = 207
+    else:
+        status_code = 200
+    return jsonify({"applied": applied, "results": results}), status_code
 
-                    entry = Entry(
-                        title=title.strip(),
-                        description=f"CFW dosyası: {title}",
-                        file_path=download_url.split("/")[-1],
-                        file_size="N/A",
-                        category_id=category_id,
-                        psp_model=psp_model,
-                        firmware_type="cfw",
-                    )
-                    db.session.add(entry)
-                    count += 1
-    except Exception as e:
-        print(f"CFW import error: {e}")
 
-    return count
+@app.route("/admin/import-legacy", methods=["POST"])
+def admin_import_legacy():
+    """XPD dosyalarından verileri içe aktarma işini kuyruğa al"""
+    if active_job("import_legacy"):
+        flash(get_translation(request.lang, "job_already_running"), "error")
+    else:
+        job = job_runner.submit("import_legacy")
+        flash(f"{get_translation(request.lang, 'job_started')} (#{job.id})", "success")
 
+    return redirect(url_for("admin_jobs"))
 
-def import_from_ofw_html(file_path, category_id):
-    """OFW HTML dosyasından verileri içe aktar"""
-    count = 0
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            import re
-
-            downloads = re.findall(r'<a href="([^"]+\.xpd)"[^>]*>([^<]+)</a>', content)
-            for download_url, title in downloads:
-                existing = Entry.query.filter_by(title=title.strip()).first()
-                if not existing:
-                    # PSP modelini tespit et
-                    psp_model = (
-                        "pspgo"
-                        if "go" in title.lower() or "psp-go" in title.lower()
-                        else "psp"
-                    )
 
-                    entry = Entry(
-                        title=title.strip(),
-                        description=f"OFW dosyası: {title}",
-                        file_path=download_url.split("/")[-1],
-                        file_size="N/A",
-                        category_id=category_id,
-                        psp_model=psp_model,
-                        firmware_type="ofw",
-                    )
-                    db.session.add(entry)
-                    count += 1
-    except Exception as e:
-        print(f"OFW import error: {e}")
+@app.route("/admin/jobs")
+def admin_jobs():
+    jobs = Job.query.order_by(Job.id.desc()).limit(50).all()
+    return render_template("admin/jobs.html", jobs=jobs)
 
-    return count
 
+@app.route("/admin/jobs/<int:job_id>/cancel", methods=["POST"])
+def admin_cancel_job(job_id):
+    job = Job.query.get_or_404(job_id)
+    job_runner.cancel(job)
+
+    flash(get_translation(request.lang, "job_cancel_requested"), "success")
+    return redirect(url_for("admin_jobs"))
 
-def import_from_pdc_html(file_path, category_id):
-    """PDC HTML dosyasından demo verilerini içe aktar"""
-    count = 0
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            import re
 
-            # PDC formatında tablo verilerini parse et
-            table_rows = re.findall(
-                r'<tr[^>]*>.*?<td[^>]*><img[^>]+></td>.*?<td[^>]*>([^<]+)</td>.*?<td[^>]*>([^<]+)</td>.*?<td[^>]*><a href="([^"]+)"[^>]*>',
-                content,
-                re.DOTALL,
+def legacy_import_steps():
+    """Eski verileri içe aktarma adımlarını (etiket, fonksiyon) listesi olarak döndür"""
+    steps = []
+
+    # Firmware kategorisi için CFW ve OFW dosyalarını XPD'lerden al
+    firmware_category = Category.query.filter_by(slug="firmware").first()
+    if firmware_category:
+        # CFW klasöründeki XPD dosyalarını işle
+        steps.append(
+            (
+                "cfw",
+                partial(import_from_xpd_directory, "cfw", firmware_category.id, "CFW"),
             )
-            for title, size, download_url in table_rows:
-                existing = Entry.query.filter_by(title=title.strip()).first()
-                if not existing:
-                    entry = Entry(
-                        title=title.strip(),
-                        description=f"PSP Demo: {title}",
-                        file_path=download_url.split("/")[-1],
-                        file_size=size.strip(),
-                        category_id=category_id,
-                    )
-                    db.session.add(entry)
-                    count += 1
-    except Exception as e:
-        print(f"PDC import error: {e}")
+        )
 
-    return count
+        # OFW klasöründeki XPD dosyalarını işle (xpd/ofw altında)
+        steps.append(
+            (
+                "xpd/ofw",
+                partial(
+                    import_from_xpd_directory, "xpd/ofw", firmware_category.id, "OFW"
+                ),
+            )
+        )
 
+    # Demos kategorisi için PDC'den veri al (eski sistem)
+    demos_category = Category.query.filter_by(slug="demos").first()
+    if demos_category:
+        pdc_file = os.path.join("pdc", "main.html")
+        if os.path.exists(pdc_file):
+            steps.append(
+                (pdc_file, partial(import_from_pdc_html, pdc_file, demos_category.id))
+            )
 
-def import_from_plugins_html(file_path, category_id):
-    """Plugins HTML dosyasından verileri içe aktar"""
+    # Plugins kategorisi için seplugins'den veri al (eski sistem)
+    plugins_category = Category.query.filter_by(slug="plugins").first()
+    if plugins_category:
+        plugins_file = os.path.join("seplugins", "main.html")
+        if os.path.exists(plugins_file):
+            steps.append(
+                (
+                    plugins_file,
+                    partial(
+                        import_from_plugins_html, plugins_file, plugins_category.id
+                    ),
+                )
+            )
+
+    # Extras kategorisi için extras'dan veri al (eski sistem)
+    extras_category = Category.query.filter_by(slug="extras").first()
+    if extras_category:
+        extras_file = os.path.join("extras", "main.html")
+        if os.path.exists(extras_file):
+            steps.append(
+                (
+                    extras_file,
+                    partial(import_from_extras_html, extras_file, extras_category.id),
+                )
+            )
+
+    return steps
+
+
+IMPORT_STEP_UNITS = 100  # her içe aktarma adımının ilerleme çubuğundaki payı
+IMPORT_PROGRESS_EVERY = 50  # satır; ilerleme ve iptal bu aralıkla kontrol edilir
+
+
+@job_handler("import_legacy")
+def run_import_legacy(job):
+    """Eski verileri adım adım içe aktar; her adım ayrı commit edilir"""
+    steps = legacy_import_steps()
+    import_count = 0
+
+    total = len(steps) * IMPORT_STEP_UNITS
+
+    for index, (label, step) in enumerate(steps):
+        start = index * IMPORT_STEP_UNITS
+
+        # Adım içindeki ilerleme; toplamı bilinmeyen adımlarda yalnızca satır sayısı yazılır
+        def step_progress(rows, rows_total=None):
+            done = start
+            if rows_total:
+                done += min(rows, rows_total) * IMPORT_STEP_UNITS // rows_total
+            job.report_progress(done, total, f"{label}: {rows} satır")
+
+        job.report_progress(start, total, label)
+        # İçe aktarma aynı başlığı tekrar eklemediği için yarıda kalan iş güvenle tekrar çalıştırılabilir
+        import_count += step(progress=step_progress)
+        db.session.commit()
+
+    return f"{import_count} giriş"
+
+
+def process_entry_file(entry):
+    """Entry dosyasının boyutunu hesapla; boyutu ya da dosya yoksa None döndür"""
+    file_size = entry_file_size(entry)
+    if file_size is None:
+        return None
+    entry.file_size = f"{file_size / (1024 * 1024):.1f}MB"
+    db.session.commit()
+    invalidate_xpd_cache(entry.id)
+
+    # Sonraki taramaların karşılaştırabilmesi için özeti kaydet (uzak depolar taranmaz)
+    file_path = storage.local_path(entry.file_path)
+    if file_path:
+        record_checksum(file_path)
+
+    return entry.file_size
+
+
+@job_handler("process_upload")
+def run_process_upload(job, entry_id):
+    """Yüklenen dosyanın boyutunu hesapla"""
+    entry = db.session.get(Entry, entry_id)
+    if entry is None:
+        return "Giriş bulunamadı"
+
+    job.report_progress(0, 1, entry.file_path)
+    return process_entry_file(entry) or "Dosya bulunamadı"
+
+
+@job_handler("process_uploads")
+def run_process_uploads(job, entry_ids):
+    """Toplu işlemde dosyası değişen entry'lerin boyutlarını hesapla"""
+    found = 0
+    for index, entry_id in enumerate(entry_ids):
+        entry = db.session.get(Entry, entry_id)
+        if entry is None:
+            continue
+        job.report_progress(index, len(entry_ids), entry.file_path)
+        if process_entry_file(entry):
+            found += 1
+
+    return f"{found}/{len(entry_ids)} dosya"
+
+
+class LegacyHTMLExtractor(HTMLParser):
+    """Eski portal sayfalarından tablo satırlarını ve bağlantıları çıkaran ayrıştırıcı
+
+    Kapatılmamış <td>/<tr> etiketleri tarayıcılardaki gibi bir sonraki hücre ya da
+    satır başladığında kapatılır. Kayıtlar parça parça beslenirken records'ta birikir:
+    ("link", href, metin) ve ("row", [{"text", "href", "src"}, ...]).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self._row = None
+        self._cell = None
+        self._link = None
+
+    def _close_cell(self):
+        if self._cell is not None:
+            self._cell["text"] = " ".join("".join(self._cell["text"]).split())
+            self._row.append(self._cell)
+            self._cell = None
+
+    def _close_row(self):
+        if self._row is not None:
+            self._close_cell()
+            if self._row:
+                self.records.append(("row", self._row))
+            self._row = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "tr":
+            self._close_row()
+            self._row = []
+        elif tag in ("td", "th"):
+            if self._row is None:
+                self._row = []
+            self._close_cell()
+            self._cell = {"text": [], "href": None, "src": None}
+        elif tag == "a" and attrs.get("href"):
+            self._link = {"href": attrs["href"], "text": []}
+            if self._cell is not None and self._cell["href"] is None:
+                self._cell["href"] = attrs["href"]
+        elif tag == "img" and self._cell is not None and self._cell["src"] is None:
+            self._cell["src"] = attrs.get("src")
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._link is not None:
+            text = " ".join("".join(self._link["text"]).split())
+            self.records.append(("link", self._link["href"], text))
+            self._link = None
+        elif tag in ("td", "th"):
+            self._close_cell()
+        elif tag in ("tr", "table"):
+            self._close_row()
+
+    def handle_data(self, data):
+        if self._link is not None:
+            self._link["text"].append(data)
+        elif self._cell is not None:
+            # Bağlantı metni hücre metnine katılmaz
+            self._cell["text"].append(data)
+
+    def close(self):
+        super().close()
+        self._close_row()
+
+
+def extract_html_records(file_path, chunk_size=64 * 1024):
+    """HTML dosyasını parça parça okuyup satır ve bağlantı kayıtlarını üret"""
+    parser = LegacyHTMLExtractor()
+    with open(file_path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            yield from parser.records
+            parser.records.clear()
+    parser.close()
+    yield from parser.records
+
+
+def row_download(cells, extensions):
+    """Satırdaki indirme ikonunu (metinsiz bağlantı) ve diğer hücre metinlerini döndür"""
+    for cell in cells:
+        href = cell["href"]
+        if href and not cell["text"] and href.lower().endswith(extensions):
+            texts = [c["text"] for c in cells if c["text"] and not c["href"]]
+            return (href, texts) if texts else None
+    return None
+
+
+def extract_html_downloads(file_path, extensions):
+    """Uzantısı uyan indirme bağlantılarını (href, metinler) olarak üret
+
+    Metinli bağlantılarda metin bağlantının kendisidir; yalnızca görsel içeren
+    bağlantılarda (indirme ikonları) satırdaki diğer hücrelerin metinleri kullanılır.
+    """
+    for record in extract_html_records(file_path):
+        if record[0] == "row":
+            download = row_download(record[1], extensions)
+            if download:
+                yield download
+        elif record[2] and record[1].lower().endswith(extensions):
+            yield record[1], [record[2]]
+
+
+def guess_psp_model(title):
+    """Başlıktan PSP modelini tahmin et"""
+    title = title.lower()
+    return "pspgo" if "go" in title or "psp-go" in title else "psp"
+
+
+def import_html_downloads(
+    file_path,
+    category_id,
+    label,
+    description,
+    extensions=(".xpd",),
+    progress=None,
+    **fields,
+):
+    """HTML sayfasındaki indirme bağlantılarını entry olarak içe aktar
+
+    progress verilirse her IMPORT_PROGRESS_EVERY satırda işlenen satır sayısıyla çağrılır.
+    """
     count = 0
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            import re
-
-            downloads = re.findall(r'<a href="([^"]+\.xpd)"[^>]*>([^<]+)</a>', content)
-            for download_url, title in downloads:
-                existing = Entry.query.filter_by(title=title.strip()).first()
-                if not existing:
-                    entry = Entry(
-                        title=title.strip(),
-                        description=f"PSP Plugin: {title}",
-                        file_path=download_url.split("/")[-1],
-                        file_size="N/A",
-                        category_id=category_id,
-                    )
-                    db.session.add(entry)
-                    count += 1
+        downloads = extract_html_downloads(file_path, extensions)
+        for rows, (download_url, texts) in enumerate(downloads, 1):
+            if progress and rows % IMPORT_PROGRESS_EVERY == 0:
+                progress(rows)
+            title = texts[0]
+            existing = Entry.query.filter_by(title=title).first()
+            if not existing:
+                entry_fields = dict(fields)
+                if entry_fields.get("firmware_type"):
+                    entry_fields["psp_model"] = guess_psp_model(title)
+                if "file_size" not in entry_fields:
+                    entry_fields["file_size"] = "N/A"
+                entry = Entry(
+                    title=title,
+                    description=f"{description}: {title}",
+                    file_path=download_url.split("/")[-1],
+                    category_id=category_id,
+                    **entry_fields,
+                )
+                db.session.add(entry)
+                count += 1
+    except JobCancelled:
+        raise
     except Exception as e:
-        print(f"Plugins import error: {e}")
+        print(f"{label} import error: {e}")
 
     return count
 
 
-def import_from_seplugins_html(file_path, category_id):
-    """Seplugins HTML dosyasından verileri içe aktar"""
-    count = 0
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            import re
+def import_from_cfw_html(file_path, category_id, progress=None):
+    """CFW HTML dosyasından verileri içe aktar"""
+    return import_html_downloads(
+        file_path,
+        category_id,
+        "CFW",
+        "CFW dosyası",
+        progress=progress,
+        firmware_type="cfw",
+    )
 
-            # Plugin indirme linklerini bul
-            downloads = re.findall(
-                r'href="([^"]+\.(?:xpd|prx))"[^>]*>([^<]+)</a>', content
-            )
-            for download_url, title in downloads:
-                existing = Entry.query.filter_by(title=title.strip()).first()
-                if not existing:
-                    entry = Entry(
-                        title=title.strip(),
-                        description=f"PSP Plugin: {title}",
-                        file_path=download_url.split("/")[-1],
-                        file_size="N/A",
-                        category_id=category_id,
-                    )
-                    db.session.add(entry)
-                    count += 1
-    except Exception as e:
-        print(f"Seplugins import error: {e}")
 
-    return count
+def import_from_ofw_html(file_path, category_id, progress=None):
+    """OFW HTML dosyasından verileri içe aktar"""
+    return import_html_downloads(
+        file_path,
+        category_id,
+        "OFW",
+        "OFW dosyası",
+        progress=progress,
+        firmware_type="ofw",
+    )
 
 
-def import_from_extras_html(file_path, category_id):
-    """Extras HTML dosyasından verileri içe aktar"""
+def import_from_pdc_html(file_path, category_id, progress=None):
+    """PDC HTML dosyasından demo verilerini içe aktar"""
     count = 0
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-            import re
-
-            downloads = re.findall(r'<a href="([^"]+\.xpd)"[^>]*>([^<]+)</a>', content)
-            for download_url, title in downloads:
-                existing = Entry.query.filter_by(title=title.strip()).first()
-                if not existing:
-                    entry = Entry(
-                        title=title.strip(),
-                        description=f"PSP Extra: {title}",
-                        file_path=download_url.split("/")[-1],
-                        file_size="N/A",
-                        category_id=category_id,
-                    )
-                    db.session.add(entry)
-                    count += 1
+        # PDC tablosu: ikon | demo adı | boyut | indirme ikonu
+        for rows, record in enumerate(extract_html_records(file_path), 1):
+            if progress and rows % IMPORT_PROGRESS_EVERY == 0:
+                progress(rows)
+            download = record[0] == "row" and row_download(record[1], ("",))
+            if not download:
+                continue
+            download_url, texts = download
+            title = texts[0]
+            existing = Entry.query.filter_by(title=title).first()
+            if not existing:
+                entry = Entry(
+                    title=title,
+                    description=f"PSP Demo: {title}",
+                    file_path=download_url.split("/")[-1],
+                    file_size=texts[1] if len(texts) > 1 else "N/A",
+                    category_id=category_id,
+                )
+                db.session.add(entry)
+                count += 1
+    except JobCancelled:
+        raise
     except Exception as e:
-        print(f"Extras import error: {e}")
+        print(f"PDC import error: {e}")
 
     return count
 
 
+def import_from_plugins_html(file_path, category_id, progress=None):
+    """Plugins HTML dosyasından verileri içe aktar"""
+    return import_html_downloads(
+        file_path, category_id, "Plugins", "PSP Plugin", progress=progress
+    )
+
+
+def import_from_seplugins_html(file_path, category_id, progress=None):
+    """Seplugins HTML dosyasından verileri içe aktar"""
+    return import_html_downloads(
+        file_path,
+        category_id,
+        "Seplugins",
+        "PSP Plugin",
+        (".xpd", ".prx"),
+        progress=progress,
+    )
+
+
+def import_from_extras_html(file_path, category_id, progress=None):
+    """Extras HTML dosyasından verileri içe aktar"""
+    return import_html_downloads(
+        file_path, category_id, "Extras", "PSP Extra", progress=progress
+    )
+
+
+def parse_xpd_content(content):
+    """XPD metnini {bölüm: {anahtar: değer}} sözlüğüne çevirir"""
+    xpd_data = {}
+    current_section = None
+
+    for line in content.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith("[") and line.endswith("]"):
+            current_section = line[1:-1]
+            continue
+
+        if "=" in line and current_section:
+            key, value = line.split("=", 1)
+            if current_section not in xpd_data:
+                xpd_data[current_section] = {}
+            xpd_data[current_section][key] = value
+
+    return xpd_data
+
+
 def parse_xpd_file(file_path):
     """XPD dosyasını parse eder ve içindeki bilgileri döndürür"""
     try:
         with open(file_path, "r", encoding="utf-8") as f:
             content = f.read()
 
-        xpd_data = {}
-        current_section = None
-
-        for line in content.split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-
-            if line.startswith("[") and line.endswith("]"):
-                current_section = line[1:-1]
-                continue
-
-            if "=" in line and current_section:
-                key, value = line.split("=", 1)
-                if current_section not in xpd_data:
-                    xpd_data[current_section] = {}
-                xpd_data[current_section][key] = value
-
-        return xpd_data
+        return parse_xpd_content(content)
     except Exception as e:
         print(f"XPD parse error for {file_path}: {e}")
         return None
 
 
-def import_from_xpd_directory(directory_path, category_id, prefix):
+def import_from_xpd_directory(directory_path, category_id, prefix, progress=None):
     """Belirtilen klasördeki tüm XPD dosyalarını içe aktarır"""
     import glob
 
@@ -798,7 +2556,9 @@ def import_from_xpd_directory(directory_path, category_id, prefix):
         xpd_pattern = os.path.join(directory_path, "**", "*.xpd")
         xpd_files = glob.glob(xpd_pattern, recursive=True)
 
-        for xpd_file in xpd_files:
+        for rows, xpd_file in enumerate(xpd_files, 1):
+            if progress and rows % IMPORT_PROGRESS_EVERY == 0:
+                progress(rows, len(xpd_files))
             xpd_data = parse_xpd_file(xpd_file)
             if not xpd_data or "Info" not in xpd_data:
                 continue
@@ -878,12 +2638,1271 @@ def import_from_xpd_directory(directory_path, category_id, prefix):
             else:
                 print(f"Skipped (exists): {title}")
 
+    except JobCancelled:
+        raise
     except Exception as e:
         print(f"XPD directory import error for {directory_path}: {e}")
 
     return count
 
 
+# XPD mirror: [File] bağlantılarını bir kez indirip yerelden sun
+MIRROR_MAX_ATTEMPTS = 3
+MIRROR_TIMEOUT = 60  # saniye
+
+
+def is_mirrorable_url(url):
+    """Bağlantı yansılanacak hostlardan birine mi ait?"""
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return False
+
+    host = parts.hostname.lower()
+    hosts = app.config["MIRROR_HOSTS"]
+    return not hosts or any(host == h or host.endswith("." + h) for h in hosts)
+
+
+def extract_xpd_urls(xpd_data):
+    """XPD [File] bölümündeki indirme bağlantılarını döndür"""
+    if not xpd_data or "File" not in xpd_data:
+        return []
+
+    return [
+        value.strip()
+        for value in xpd_data["File"].values()
+        if value.strip().lower().startswith(("http://", "https://"))
+    ]
+
+
+def register_mirror_urls(urls):
+    """Yansılanabilir bağlantıları kaydet ve {url: MirrorObject} döndür"""
+    urls = [url for url in dict.fromkeys(urls) if is_mirrorable_url(url)]
+    if not urls:
+        return {}
+
+    # Aynı yeni XPD'yi aynı anda isteyen iki PSP aynı bağlantıları eklemeye çalışabilir;
+    # url benzersiz olduğu için kaybeden taraf geri alıp tekrar okur
+    for attempt in range(3):
+        objects = {
+            obj.url: obj
+            for obj in MirrorObject.query.filter(MirrorObject.url.in_(urls)).all()
+        }
+        for url in urls:
+            if url not in objects:
+                obj = MirrorObject(
+                    url=url, local_name=hashlib.sha1(url.encode("utf-8")).hexdigest()
+                )
+                db.session.add(obj)
+                objects[url] = obj
+
+        try:
+            db.session.commit()
+            return objects
+        except IntegrityError:
+            db.session.rollback()
+            if attempt == 2:
+                raise
+
+
+def download_to_mirror(url, dest_path, max_size=None):
+    """URL'yi dest_path'e indir; yarım kalan .part dosyasından devam eder"""
+    if os.path.exists(dest_path):
+        return os.path.getsize(dest_path)
+
+    part_path = dest_path + ".part"
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+
+    req = urllib.request.Request(url, headers={"User-Agent": "psp-portal-mirror"})
+    if offset:
+        req.add_header("Range", f"bytes={offset}-")
+
+    try:
+        response = urllib.request.urlopen(req, timeout=MIRROR_TIMEOUT)
+    except urllib.error.HTTPError as e:
+        if e.code == 416 and offset:
+            # Content-Range: bytes */<toplam>
+            total = (e.headers.get("Content-Range") or "").rpartition("/")[2]
+            if total.isdigit() and int(total) == offset:
+                # .part zaten tamamlanmış ama yeniden adlandırılamamış
+                os.replace(part_path, dest_path)
+                return offset
+            # Kaynak dosya küçülmüş ya da değişmiş: baştan indir
+            os.remove(part_path)
+            return download_to_mirror(url, dest_path, max_size)
+        raise
+
+    with response:
+        if offset and response.status != 206:
+            # Sunucu Range desteklemiyor, baştan indir
+            offset = 0
+
+        remaining = response.headers.get("Content-Length")
+        expected = offset + int(remaining) if remaining is not None else None
+        if max_size is not None and expected is not None and expected > max_size:
+            raise ValueError(f"Dosya mirror kotasından büyük ({expected} bayt)")
+
+        with open(part_path, "ab" if offset else "wb") as f:
+            shutil.copyfileobj(response, f, 1024 * 1024)
+
+    size = os.path.getsize(part_path)
+    if expected is not None and size != expected:
+        raise IOError(f"Eksik indirme: {size}/{expected} bayt")
+
+    os.replace(part_path, dest_path)
+    return size
+
+
+def enforce_mirror_quota():
+    """Kota aşıldıysa en uzun süredir erişilmeyen kopyaları sil (LRU)"""
+    quota = app.config["MIRROR_QUOTA"]
+    used = (
+        db.session.query(db.func.coalesce(db.func.sum(MirrorObject.size), 0))
+        .filter(MirrorObject.status == "ready")
+        .scalar()
+    )
+
+    if used > quota:
+        lru = (
+            MirrorObject.query.filter_by(status="ready")
+            .order_by(MirrorObject.last_access)
+            .all()
+        )
+        for obj in lru:
+            if used <= quota:
+                break
+            if os.path.exists(obj.local_path):
+                os.remove(obj.local_path)
+            used -= obj.size or 0
+            db.session.delete(obj)
+
+    db.session.commit()
+    # Yeni hazırlanan ya da silinen kopyalar manifestleri değiştirir
+    invalidate_xpd_cache()
+
+
+def queue_mirror_fetch():
+    """Bekleyen indirmeler için çalışan bir mirror işi yoksa yenisini başlat"""
+    # mirror_sync de indirmeleri kendi içinde çalıştırır
+    return (
+        active_job("mirror_sync")
+        or active_job("mirror_fetch")
+        or job_runner.submit("mirror_fetch")
+    )
+
+
+def claim_mirror_object(object_id):
+    """Kaydı 'fetching' durumuna al; başka bir iş daha önce aldıysa False döndür
+
+    Aynı bağlantıyı iki işin birlikte indirip aynı .part dosyasına yazmasını önler.
+    """
+    claimed = (
+        MirrorObject.query.filter(
+            MirrorObject.id == object_id,
+            MirrorObject.status.in_(["pending", "failed"]),
+        ).update({"status": "fetching"}, synchronize_session=False)
+        == 1
+    )
+    db.session.commit()
+    return claimed
+
+
+# Dinamik XPD manifestleri: (entry_id, host) -> (updated_at, içerik, mirror bekliyor mu)
+# Host başlığı istemciden geldiği için boyut sınırlı LRU
+XPD_CACHE = OrderedDict()
+XPD_CACHE_SIZE = 1024
+XPD_CACHE_LOCK = threading.Lock()
+
+
+def invalidate_xpd_cache(entry_id=None):
+    """Entry'nin (ya da tüm entry'lerin) önbellekteki manifestlerini sil"""
+    with XPD_CACHE_LOCK:
+        if entry_id is None:
+            XPD_CACHE.clear()
+            return
+
+        for key in [key for key in XPD_CACHE if key[0] == entry_id]:
+            XPD_CACHE.pop(key, None)
+
+
+def serialize_xpd(xpd_data):
+    """{bölüm: {anahtar: değer}} sözlüğünü XPD metnine çevirir"""
+    lines = []
+    for section, values in xpd_data.items():
+        lines.append(f"[{section}]")
+        # Değerdeki satır sonu (ör. başlıktaki) manifeste yeni satır eklemesin
+        lines.extend(
+            f"{key}={' '.join(str(value).splitlines())}"
+            for key, value in values.items()
+        )
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def local_blob_path(url):
+    """Portalın kendi hostuna işaret eden bağlantının yerel yolunu döndür"""
+    parts = urlsplit(url)
+    if (parts.hostname or "").lower() not in app.config["PORTAL_HOSTS"]:
+        return None
+    path = parts.path.lstrip("/")
+    return path if path and safe_join(os.getcwd(), path) else None
+
+
+def local_blob_size(url):
+    """Portalın kendi dosyasına (ya da ZIP üyesine) işaret eden bağlantının boyutunu döndür"""
+    path = local_blob_path(url)
+    if not path:
+        return None
+
+    if path.startswith("zip/"):
+        located = locate_zip_member(path[len("zip/") :])
+        return located[1].file_size if located else None
+
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return None
+
+
+def build_entry_xpd(entry):
+    """Entry için XPD manifestini üret; (içerik, mirror bekliyor mu) ya da None döndür"""
+    if entry.file_path.lower().endswith(".xpd"):
+        file_path = find_entry_file(entry) or storage_file(entry.file_path)
+        if file_path is None:
+            return None
+
+        # Eski XPD'ler: bilgiler dosyadan, bağlantılar mirror'dan
+        xpd_data = parse_xpd_file(file_path)
+        if not xpd_data:
+            return None  # Okunamayan XPD olduğu gibi gönderilir
+        info = dict(xpd_data.get("Info", {}))
+        files = dict(xpd_data.get("File", {}))
+        sizes = []
+        needs_fetch = False
+
+        objects = register_mirror_urls(extract_xpd_urls(xpd_data))
+        for key, url in files.items():
+            obj = objects.get(url.strip())
+            if obj is None:
+                sizes.append(local_blob_size(url))
+            elif obj.status == "ready":
+                files[key] = url_for(
+                    "mirror_file",
+                    object_id=obj.id,
+                    filename=obj.filename,
+                    _external=True,
+                )
+                sizes.append(obj.size)
+            else:
+                # İlk istek indirmeyi tetikler; o zamana kadar istemci kaynağa gider
+                sizes.append(None)
+                needs_fetch = needs_fetch or obj.attempts < MIRROR_MAX_ATTEMPTS
+    else:
+        # Yüklenen dosyalar: manifest tamamen entry'den üretilir
+        file_size = entry_file_size(entry)
+        if file_size is None:
+            return None
+        # brewxpd.sh'deki gibi kurulum klasörü adı (Code) başlıktan türetilir
+        # PSP klasör adı olarak yalnızca ASCII harf ve rakamlar kullanılabilir
+        code = "".join(c for c in entry.title.upper() if c.isascii() and c.isalnum())[
+            :16
+        ]
+        info = {
+            "EID": "gdp#",
+            "Desc": entry.title,
+            "Size": "0",
+            "Code": code or f"PSP{entry.id}",
+            "FName": os.path.basename(entry.file_path),
+        }
+        files = {"C": url_for("download_file", entry_id=entry.id, _external=True)}
+        sizes = [file_size]
+        needs_fetch = False
+
+    # Boyut (KB) yalnızca tüm dosyaların gerçek boyutu biliniyorsa güncellenir
+    if sizes and None not in sizes:
+        info["Size"] = str(sum(sizes) // 1024)
+
+    content = serialize_xpd({"Info": info, "File": files})
+    return content.encode("utf-8"), needs_fetch
+
+
+def xpd_manifest_response(entry):
+    """Entry'nin XPD manifestini önbellekten (yoksa üretip) gönder"""
+    key = (entry.id, request.host_url)
+    with XPD_CACHE_LOCK:
+        cached = XPD_CACHE.get(key)
+        if cached is not None:
+            XPD_CACHE.move_to_end(key)
+    if cached is None or cached[0] != entry.updated_at:
+        built = build_entry_xpd(entry)
+        if built is None:
+            return None
+        cached = (entry.updated_at, *built)
+        with XPD_CACHE_LOCK:
+            XPD_CACHE[key] = cached
+            XPD_CACHE.move_to_end(key)
+            while len(XPD_CACHE) > XPD_CACHE_SIZE:
+                XPD_CACHE.popitem(last=False)
+
+    _, content, needs_fetch = cached
+    if needs_fetch:
+        queue_mirror_fetch()
+
+    if entry.file_path.lower().endswith(".xpd"):
+        download_name = os.path.basename(entry.file_path)
+    else:
+        download_name = f"{entry.id}.xpd"
+
+    response = app.response_class(content, mimetype="application/octet-stream")
+    response.headers.set("Content-Disposition", "attachment", filename=download_name)
+    return response
+
+
+@app.route("/xpd/<int:entry_id>.xpd")
+def entry_xpd(entry_id):
+    entry = Entry.query.get_or_404(entry_id)
+
+    response = xpd_manifest_response(entry)
+    if response is None:
+        abort(404)
+    return response
+
+
+@job_handler("mirror_fetch")
+def run_mirror_fetch(job):
+    """Bekleyen bağlantıları sınırlı eşzamanlılıkla mirror klasörüne indir"""
+    done = 0
+    failed = 0
+
+    while True:
+        pending = MirrorObject.query.filter(
+            MirrorObject.status.in_(["pending", "failed"]),
+            MirrorObject.attempts < MIRROR_MAX_ATTEMPTS,
+        ).all()
+        if not pending:
+            break
+
+        pending = [obj for obj in pending if claim_mirror_object(obj.id)]
+        if not pending:
+            break
+
+        total = done + len(pending)
+        claimed = [obj.id for obj in pending]
+        pool = ThreadPoolExecutor(
+            max_workers=app.config["MIRROR_CONCURRENCY"], thread_name_prefix="mirror"
+        )
+        try:
+            futures = {
+                pool.submit(
+                    download_to_mirror,
+                    obj.url,
+                    obj.local_path,
+                    app.config["MIRROR_QUOTA"],
+                ): obj.id
+                for obj in pending
+            }
+            job.report_progress(done, total)
+            for future in as_completed(futures):
+                obj = db.session.get(MirrorObject, futures[future])
+                obj.attempts += 1
+                try:
+                    obj.size = future.result()
+                    obj.status = "ready"
+                    obj.error = None
+                    obj.fetched_at = obj.last_access = datetime.utcnow()
+                except Exception as e:
+                    obj.status = "failed"
+                    obj.error = str(e)[:500]
+                    failed += 1
+                    print(f"Mirror fetch error for {obj.url}: {e}")
+
+                done += 1
+                message = obj.filename
+                enforce_mirror_quota()
+                job.report_progress(done, total, message)
+        finally:
+            # İptal edilirse kuyruktaki indirmeleri başlatma
+            pool.shutdown(wait=True, cancel_futures=True)
+            # Sonucu yazılmamış kayıtları sonraki işe bırak
+            MirrorObject.query.filter(
+                MirrorObject.id.in_(claimed), MirrorObject.status == "fetching"
+            ).update({"status": "pending"}, synchronize_session=False)
+            db.session.commit()
+
+    return f"{done} dosya işlendi, {failed} hata"
+
+
+@job_handler("mirror_sync")
+def run_mirror_sync(job):
+    """Tüm XPD dosyalarındaki bağlantıları kaydet ve indir"""
+    import glob
+
+    directories = CONTENT_DIRECTORIES + [app.config["DOWNLOAD_FOLDER"]]
+    xpd_files = [
+        path
+        for directory in directories
+        for path in glob.glob(os.path.join(directory, "**", "*.xpd"), recursive=True)
+    ]
+
+    urls = []
+    for index, xpd_file in enumerate(xpd_files):
+        urls.extend(extract_xpd_urls(parse_xpd_file(xpd_file)))
+        if index % 50 == 0:
+            job.report_progress(index, len(xpd_files), xpd_file)
+
+    register_mirror_urls(urls)
+    return run_mirror_fetch(job)
+
+
+@app.route("/mirror/<int:object_id>/<path:filename>")
+def mirror_file(object_id, filename):
+    obj = MirrorObject.query.get_or_404(object_id)
+
+    if obj.status != "ready" or not os.path.exists(obj.local_path):
+        # Yerel kopya yoksa kaynağa yönlendir
+        return redirect(obj.url)
+
+    obj.last_access = datetime.utcnow()
+    db.session.commit()
+    return send_file(obj.local_path, as_attachment=True, download_name=obj.filename)
+
+
+@app.route("/admin/mirror-sync", methods=["POST"])
+def admin_mirror_sync():
+    if active_job("mirror_sync") or active_job("mirror_fetch"):
+        flash(get_translation(request.lang, "job_already_running"), "error")
+    else:
+        job = job_runner.submit("mirror_sync")
+        flash(f"{get_translation(request.lang, 'job_started')} (#{job.id})", "success")
+
+    return redirect(url_for("admin_jobs"))
+
+
+# Bütünlük taraması: yerel dosyaları XPD Size alanları ve kayıtlı özetlerle karşılaştır
+SCRUB_CHUNK_SIZE = 8 * 1024 * 1024
+# Dosyanın kendisi okunarak bulunan sorunlar (boyut iddialarından farklı olarak)
+SCRUB_CONTENT_FINDINGS = ("corrupt", "unreadable")
+
+
+class RateLimiter:
+    """Thread'ler arasında paylaşılan bayt/sn sınırlayıcı (0 = sınırsız)"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def consume(self, amount):
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + amount / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+
+def hash_file(path, limiter=None):
+    """Dosyanın SHA-256 özetini mmap üzerinden büyük sıralı okumalarla hesapla"""
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            with memoryview(mapped) as view:
+                for offset in range(0, size, SCRUB_CHUNK_SIZE):
+                    with view[offset : offset + SCRUB_CHUNK_SIZE] as chunk:
+                        if limiter is not None:
+                            limiter.consume(len(chunk))
+                        digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def record_checksum(path):
+    """Dosyanın güncel özetini FileChecksum tablosuna yaz"""
+    stat = os.stat(path)
+    checksum = FileChecksum.query.filter_by(path=path).first()
+    if checksum is None:
+        checksum = FileChecksum(path=path)
+        db.session.add(checksum)
+
+    checksum.sha256 = hash_file(path)
+    checksum.size = stat.st_size
+    checksum.mtime = stat.st_mtime
+    checksum.checked_at = datetime.utcnow()
+    db.session.commit()
+    return checksum
+
+
+def scrub_candidates():
+    """Taranacak tüm yerel dosyaları döndür"""
+    paths = []
+    for directory in CONTENT_DIRECTORIES + [app.config["DOWNLOAD_FOLDER"]]:
+        for root, _, names in os.walk(directory):
+            paths.extend(os.path.join(root, name) for name in sorted(names))
+    return paths
+
+
+def check_size_claims():
+    """XPD Size alanları ve entry boyutlarıyla gerçek dosyaları karşılaştır"""
+    findings = []
+
+    xpd_files = [path for path in scrub_candidates() if path.lower().endswith(".xpd")]
+    for xpd_file in xpd_files:
+        xpd_data = parse_xpd_file(xpd_file) or {}
+        urls = extract_xpd_urls(xpd_data)
+        local_paths = [local_blob_path(url) for url in urls]
+        if not urls or None in local_paths:
+            continue  # Dış kaynaklı dosyalar burada doğrulanamaz
+
+        sizes = [local_blob_size(url) for url in urls]
+        missing = [path for path, size in zip(local_paths, sizes) if size is None]
+        for path in missing:
+            findings.append(
+                ScrubFinding(
+                    path=path,
+                    kind="missing",
+                    detail="XPD'de listelenmiş",
+                    source=xpd_file,
+                )
+            )
+
+        claimed = xpd_data.get("Info", {}).get("Size", "").strip()
+        if missing or not claimed.isdigit():
+            continue
+        actual = sum(sizes) // 1024
+        # Elle yazılmış XPD'lerde yukarı yuvarlama olabilir
+        if abs(actual - int(claimed)) > 1:
+            findings.append(
+                ScrubFinding(
+                    path=", ".join(local_paths),
+                    kind="size_mismatch",
+                    detail=f"XPD Size={claimed} KB, gerçek={actual} KB",
+                    source=xpd_file,
+                )
+            )
+
+    # Yüklenen dosyalar: entry'de kayıtlı boyut
+    for entry in Entry.query.filter(Entry.file_size.isnot(None)).all():
+        if entry.file_path.lower().endswith(".xpd") or not entry.file_size.endswith(
+            "MB"
+        ):
+            continue
+        path = storage.location(entry.file_path)
+        info = storage.stat(entry.file_path)
+        if info is None:
+            if find_entry_file(entry) is None:
+                findings.append(
+                    ScrubFinding(path=path, kind="missing", source=f"Entry #{entry.id}")
+                )
+            continue
+
+        actual = f"{info[0] / (1024 * 1024):.1f}MB"
+        if actual != entry.file_size:
+            findings.append(
+                ScrubFinding(
+                    path=path,
+                    kind="size_mismatch",
+                    detail=f"Entry boyutu={entry.file_size}, gerçek={actual}",
+                    source=f"Entry #{entry.id}",
+                )
+            )
+
+    return findings
+
+
+def run_scrub(full=False, job=None):
+    """Değişen dosyaları paralel olarak özetle, bulguları ScrubFinding'e yaz"""
+    paths = scrub_candidates()
+    known = {checksum.path: checksum for checksum in FileChecksum.query.all()}
+
+    # Yalnızca boyutu ya da mtime'ı değişen dosyalar yeniden özetlenir
+    targets = {}
+    for path in paths:
+        stat = os.stat(path)
+        checksum = known.get(path)
+        if (
+            full
+            or checksum is None
+            or checksum.size != stat.st_size
+            or checksum.mtime != stat.st_mtime
+        ):
+            targets[path] = stat
+
+    findings = []
+    limiter = RateLimiter(app.config["SCRUB_RATE"])
+    pool = ThreadPoolExecutor(
+        max_workers=app.config["SCRUB_WORKERS"], thread_name_prefix="scrub"
+    )
+    try:
+        futures = {pool.submit(hash_file, path, limiter): path for path in targets}
+        for index, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            stat = targets[path]
+            if job is not None and (index % 20 == 0 or index == len(futures)):
+                job.report_progress(index, len(futures), path)
+
+            try:
+                digest = future.result()
+            except OSError as e:
+                findings.append(
+                    ScrubFinding(path=path, kind="unreadable", detail=str(e))
+                )
+                continue
+
+            checksum = known.get(path)
+            if checksum is None:
+                checksum = FileChecksum(path=path)
+                db.session.add(checksum)
+                known[path] = checksum
+            elif (
+                checksum.sha256 != digest
+                and checksum.size == stat.st_size
+                and checksum.mtime == stat.st_mtime
+            ):
+                # Boyut ve mtime aynı ama içerik değişmiş: bozulma
+                findings.append(
+                    ScrubFinding(
+                        path=path,
+                        kind="corrupt",
+                        detail=f"Kayıtlı özet {checksum.sha256[:12]}, okunan {digest[:12]}",
+                    )
+                )
+                continue
+
+            checksum.sha256 = digest
+            checksum.size = stat.st_size
+            checksum.mtime = stat.st_mtime
+            checksum.checked_at = datetime.utcnow()
+    finally:
+        # İptal edilirse kuyruktaki okumaları başlatma
+        pool.shutdown(wait=True, cancel_futures=True)
+
+    # Silinmiş dosyaların kayıtlarını temizle
+    existing = set(paths)
+    for path, checksum in known.items():
+        if path not in existing:
+            db.session.delete(checksum)
+
+    # Yeniden özetlenmeyen dosyaların içerik bulguları korunur; bozulma mtime'ı
+    # değiştirmediği için artımlı tarama o dosyayı tekrar okumaz
+    kept = []
+    for finding in ScrubFinding.query.all():
+        if (
+            finding.kind in SCRUB_CONTENT_FINDINGS
+            and finding.path in existing
+            and finding.path not in targets
+        ):
+            kept.append(finding)
+        else:
+            db.session.delete(finding)
+
+    findings.extend(check_size_claims())
+    db.session.add_all(findings)
+    db.session.commit()
+
+    return len(targets), kept + findings
+
+
+@job_handler("scrub")
+def run_scrub_job(job, full=False):
+    """Zamanlanmış ya da elle başlatılan bütünlük taraması"""
+    hashed, findings = run_scrub(full=full, job=job)
+    return f"{hashed} dosya özetlendi, {len(findings)} sorun"
+
+
+job_runner.schedule("scrub", app.config["SCRUB_INTERVAL"])
+
+
+@app.cli.command("scrub")
+@click.option("--full", is_flag=True, help="Değişmemiş dosyaları da yeniden özetle")
+def scrub_command(full):
+    """Yerel dosyaların bütünlüğünü kontrol et"""
+    db.create_all()
+    hashed, findings = run_scrub(full=full)
+
+    for finding in findings:
+        click.echo(f"{finding.kind}: {finding.path} {finding.detail or ''}")
+    click.echo(f"{hashed} dosya özetlendi, {len(findings)} sorun")
+
+
+@app.route("/admin/scrub")
+def admin_scrub():
+    findings = ScrubFinding.query.order_by(ScrubFinding.kind, ScrubFinding.path).all()
+    last_job = Job.query.filter_by(kind="scrub").order_by(Job.id.desc()).first()
+    file_count = FileChecksum.query.count()
+    return render_template(
+        "admin/scrub.html", findings=findings, last_job=last_job, file_count=file_count
+    )
+
+
+@app.route("/admin/scrub", methods=["POST"])
+def admin_run_scrub():
+    if active_job("scrub"):
+        flash(get_translation(request.lang, "job_already_running"), "error")
+    else:
+        job = job_runner.submit("scrub", full=bool(request.form.get("full")))
+        flash(f"{get_translation(request.lang, 'job_started')} (#{job.id})", "success")
+
+    return redirect(url_for("admin_jobs"))
+
+
+# ZIP paketlerinin tek tek üyelerini açmadan sun
+ZIP_INDEX_CACHE = OrderedDict()  # arşiv yolu -> (mtime, boyut, {üye adı: ZipInfo})
+ZIP_INDEX_CACHE_SIZE = 32
+ZIP_INDEX_LOCK = threading.Lock()
+ZIP_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+
+def zip_index(archive_path):
+    """Arşivin central directory'sini bir kez okuyup önbellekte tut"""
+    stat = os.stat(archive_path)
+    with ZIP_INDEX_LOCK:
+        cached = ZIP_INDEX_CACHE.get(archive_path)
+        if cached and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+            ZIP_INDEX_CACHE.move_to_end(archive_path)
+            return cached[2]
+
+    with zipfile.ZipFile(archive_path) as archive:
+        members = {info.filename: info for info in archive.infolist()}
+
+    with ZIP_INDEX_LOCK:
+        ZIP_INDEX_CACHE[archive_path] = (stat.st_mtime, stat.st_size, members)
+        ZIP_INDEX_CACHE.move_to_end(archive_path)
+        while len(ZIP_INDEX_CACHE) > ZIP_INDEX_CACHE_SIZE:
+            ZIP_INDEX_CACHE.popitem(last=False)
+    return members
+
+
+def locate_zip_member(spec):
+    """'extras/x/data.zip/klasör/dosya' biçimini (arşiv yolu, ZipInfo) olarak çöz"""
+    split_at = spec.lower().find(".zip/")
+    if split_at < 0:
+        return None
+
+    archive_path = spec[: split_at + len(".zip")]
+    member_name = spec[split_at + len(".zip/") :]
+    allowed = CONTENT_DIRECTORIES + [app.config["DOWNLOAD_FOLDER"]]
+    if archive_path.split("/", 1)[0] not in allowed:
+        return None
+    if not safe_join(os.getcwd(), archive_path) or not os.path.isfile(archive_path):
+        return None
+
+    try:
+        info = zip_index(archive_path).get(member_name)
+    except zipfile.BadZipFile:
+        return None
+    if info is None or info.is_dir():
+        return None
+    return archive_path, info
+
+
+class ZipMemberStream(io.RawIOBase):
+    """ZIP üyesini arşiv içindeki bayt aralığından okuyan akış"""
+
+    def __init__(self, archive_path, info):
+        self._file = open(archive_path, "rb")
+        try:
+            # Yerel başlıktaki ad/extra uzunlukları central directory'dekinden farklı olabilir
+            self._file.seek(info.header_offset)
+            header = ZIP_LOCAL_HEADER.unpack(self._file.read(ZIP_LOCAL_HEADER.size))
+            if header[0] != b"PK\x03\x04":
+                raise zipfile.BadZipFile("Geçersiz yerel başlık")
+        except Exception:
+            self._file.close()
+            raise
+
+        name_length, extra_length = header[10], header[11]
+        self._start = (
+            info.header_offset + ZIP_LOCAL_HEADER.size + name_length + extra_length
+        )
+        self._compressed_left = info.compress_size
+        self._stored = info.compress_type == zipfile.ZIP_STORED
+        self._size = info.file_size
+        self._pos = 0
+        self._inflater = None if self._stored else zlib.decompressobj(-zlib.MAX_WBITS)
+        self._buffer = b""
+        self._file.seek(self._start)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        # Yalnızca sıkıştırılmamış üyelerde doğrudan konumlanılabilir
+        return self._stored
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if not self._stored:
+            raise io.UnsupportedOperation("Sıkıştırılmış üyede seek yapılamaz")
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._pos = max(0, min(offset, self._size))
+        self._file.seek(self._start + self._pos)
+        return self._pos
+
+    def read(self, size=-1):
+        remaining = self._size - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b""
+
+        if self._stored:
+            data = self._file.read(size)
+        else:
+            while len(self._buffer) < size and (
+                self._compressed_left or self._inflater.unconsumed_tail
+            ):
+                chunk = self._inflater.unconsumed_tail
+                if not chunk:
+                    chunk = self._file.read(min(64 * 1024, self._compressed_left))
+                    self._compressed_left -= len(chunk)
+                    if not chunk:
+                        break
+                self._buffer += self._inflater.decompress(chunk, size)
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+
+        self._pos += len(data)
+        return data
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+@app.route("/zip/<path:spec>")
+def zip_member(spec):
+    located = locate_zip_member(spec)
+    if located is None:
+        abort(404)
+
+    archive_path, info = located
+    if info.flag_bits & 0x1 or info.compress_type not in (
+        zipfile.ZIP_STORED,
+        zipfile.ZIP_DEFLATED,
+    ):
+        abort(415)  # Şifreli ya da desteklenmeyen sıkıştırma
+
+    filename = os.path.basename(info.filename)
+    response = app.response_class(
+        wrap_file(request.environ, ZipMemberStream(archive_path, info)),
+        mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+        direct_passthrough=True,
+    )
+    response.content_length = info.file_size
+    response.headers.set("Content-Disposition", "attachment", filename=filename)
+    stat = os.stat(archive_path)
+    response.set_etag(f"{int(stat.st_mtime)}-{stat.st_size}-{info.CRC:08x}")
+    return response.make_conditional(
+        request, accept_ranges=True, complete_length=info.file_size
+    )
+
+
+# Statik site dışa aktarımı: varsayılan dil kökte, diğer diller /<dil>/ altında
+STATIC_EXPORT_STATE = ".export-state.json"
+STATIC_EXPORT_GZIP_EXTENSIONS = (".html", ".xml", ".xpd")
+FIRMWARE_MODELS = ("psp", "pspgo")
+FIRMWARE_TYPES = ("cfw", "ofw")
+
+# Rota -> statik ağaçtaki yol (dil önekine göre)
+STATIC_EXPORT_PATHS = {
+    "index": "",
+    "header_frame": "header.html",
+    "footer_frame": "footer.html",
+    "main": "main.html",
+    "category_detail": "category/{slug}/",
+    "category_feed": "feeds/{slug}.xml",
+    "firmware_type_select": "firmware/type/{psp_model}/",
+    "firmware_detail": "firmware/{psp_model}/{firmware_type}/",
+}
+
+
+def static_page(endpoint, **values):
+    """Sayfa anahtarı: (rota, değerler)"""
+    return (endpoint, tuple(sorted(values.items())))
+
+
+def entry_pages(slug, psp_model, firmware_type):
+    """Entry'nin listelendiği sayfalar"""
+    pages = {static_page("category_feed", slug=slug)}
+    if slug != "firmware":
+        pages.add(static_page("category_detail", slug=slug))
+    elif psp_model in FIRMWARE_MODELS and firmware_type in FIRMWARE_TYPES:
+        pages.add(
+            static_page(
+                "firmware_detail", psp_model=psp_model, firmware_type=firmware_type
+            )
+        )
+    return pages
+
+
+class StaticSiteExporter:
+    """Katalogu statik bir ağaca yazar; yalnızca değişen entry'lerin sayfalarını yeniler
+
+    Dinamik rotaların şablonları, url_for yerine statik yolları üreten bir fonksiyonla
+    render edilir. Dosyalar geçici dosyaya yazılıp os.replace ile yerine konur ve
+    içeriği değişmeyen dosyalara dokunulmaz.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.files = set()
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+        self._download_paths = {}
+
+    # Yollar
+    @staticmethod
+    def prefix(lang):
+        return "/" if lang == DEFAULT_LANGUAGE else f"/{lang}/"
+
+    def page_file(self, lang, endpoint, values):
+        path = self.prefix(lang) + STATIC_EXPORT_PATHS[endpoint].format(**values)
+        if path.endswith("/"):
+            path += "index.html"
+        return path.lstrip("/")
+
+    def download_path(self, entry_id):
+        """İndirme bağlantısı: repodaki içerik dosyası ağaca kopyalanır, diğerleri Flask'tan"""
+        if entry_id not in self._download_paths:
+            entry = db.session.get(Entry, entry_id)
+            path = None
+            if entry.file_path.lower().endswith(".xpd"):
+                path = f"/xpd/{entry.id}.xpd"
+            elif entry.category.slug != "games":
+                # Oyunlar ISO/ adıyla indirilmesi için Flask üzerinden gider;
+                # yüklenen dosyalar depoda kalır
+                local = find_entry_file(entry)
+                if (
+                    local
+                    and not os.path.isabs(local)
+                    and local != storage.local_path(entry.file_path)
+                ):
+                    relpath = local.replace(os.sep, "/")
+                    self.copy(relpath, local)
+                    path = "/" + quote(relpath)
+            self._download_paths[entry_id] = path or self.origin_url(
+                "download_file", entry_id=entry_id
+            )
+        return self._download_paths[entry_id]
+
+    @staticmethod
+    def origin_url(endpoint, **values):
+        """Dışa aktarılmayan rotalar Flask sunucusunun mutlak adresine gider"""
+        return app.config["STATIC_EXPORT_ORIGIN_URL"] + url_for(endpoint, **values)
+
+    def url_for(self, page_lang, endpoint, _external=False, **values):
+        """Şablonlardaki url_for'un statik karşılığı"""
+        if endpoint in STATIC_EXPORT_PATHS:
+            path = self.prefix(page_lang) + STATIC_EXPORT_PATHS[endpoint].format(
+                **values
+            )
+        elif endpoint == "set_language":
+            path = self.prefix(values["lang"])
+        elif endpoint == "serve_images":
+            # images/ ağaca kopyalanır
+            path = "/images/" + quote(values["filename"])
+        elif endpoint == "download_file":
+            path = self.download_path(values["entry_id"])
+        else:
+            path = self.origin_url(endpoint, **values)
+        if _external and path.startswith("/"):
+            return app.config["STATIC_EXPORT_BASE_URL"] + path
+        return path
+
+    # Yazma
+    def write(self, relpath, content):
+        """İçerik değiştiyse dosyayı (metinlerde .gz kopyasıyla) atomik olarak yaz"""
+        path = os.path.join(self.output, *relpath.split("/"))
+        # nginx gzip_static ve CDN'ler .gz kopyasını hazır sunar
+        precompress = relpath.lower().endswith(STATIC_EXPORT_GZIP_EXTENSIONS)
+        self.files.add(relpath)
+        if os.path.isfile(path) and (not precompress or os.path.isfile(path + ".gz")):
+            with open(path, "rb") as f:
+                if f.read() == content:
+                    self.unchanged += 1
+                    return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.replace(path, content)
+        if precompress:
+            self.replace(path + ".gz", gzip.compress(content, 9, mtime=0))
+        self.written += 1
+
+    def copy(self, relpath, source):
+        """Statik dosyayı kopyala; boyutu ve mtime'ı aynıysa dokunma"""
+        path = os.path.join(self.output, *relpath.split("/"))
+        self.files.add(relpath)
+        stat = os.stat(source)
+        if os.path.isfile(path):
+            current = os.stat(path)
+            if (current.st_size, current.st_mtime) == (stat.st_size, stat.st_mtime):
+                self.unchanged += 1
+                return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        shutil.copy2(source, temp_path)
+        os.replace(temp_path, path)
+        self.written += 1
+
+    @staticmethod
+    def replace(path, content):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def remove(self, relpath):
+        self.files.discard(relpath)
+        path = os.path.join(self.output, *relpath.split("/"))
+        if os.path.exists(path + ".gz"):
+            os.remove(path + ".gz")
+        if os.path.exists(path):
+            os.remove(path)
+            self.removed += 1
+
+    # Render
+    def render_page(self, lang, endpoint, values):
+        request.lang = lang
+        context = {"url_for": partial(self.url_for, lang)}
+
+        if endpoint == "main":
+            categories = Category.query.order_by(Category.order_index).all()
+            menu = render_template(
+                "fragments/category_menu.html", categories=categories, **context
+            )
+            return render_template("main.html", category_menu=Markup(menu), **context)
+        if endpoint in ("index", "header_frame", "footer_frame"):
+            name = {
+                "index": "index",
+                "header_frame": "header",
+                "footer_frame": "footer",
+            }
+            return render_template(f"{name[endpoint]}.html", **context)
+        if endpoint == "firmware_type_select":
+            return render_template("firmware_type_select.html", **values, **context)
+
+        if endpoint == "firmware_detail":
+            category = Category.query.filter_by(slug="firmware").first()
+            entries = Entry.query.filter_by(category_id=category.id, **values).all()
+            return render_template(
+                "firmware_list.html",
+                category=category,
+                entries=entries,
+                **values,
+                **context,
+            )
+
+        category = Category.query.filter_by(slug=values["slug"]).first()
+        if endpoint == "category_feed":
+            items = feed_items(category)
+            return render_template(
+                "feed.xml", category=category, items=items, **context
+            )
+        if category.slug == "firmware":
+            return render_template(
+                "firmware_model_select.html", category=category, **context
+            )
+        entries = Entry.query.filter_by(category_id=category.id).all()
+        return render_template(
+            "category.html", category=category, entries=entries, **context
+        )
+
+    def export_manifest(self, entry):
+        """Entry'nin XPD manifestini /xpd/<id>.xpd olarak yaz"""
+        relpath = f"xpd/{entry.id}.xpd"
+        built = build_entry_xpd(entry)
+        if built is not None:
+            self.write(relpath, built[0])
+            return
+
+        # Okunamayan XPD'ler /download'daki gibi olduğu gibi gönderilir
+        file_path = find_entry_file(entry) or storage_file(entry.file_path)
+        if file_path:
+            with open(file_path, "rb") as f:
+                self.write(relpath, f.read())
+        else:
+            self.remove(relpath)
+
+    # Durum
+    def fingerprint(self, categories):
+        """Şablonlar, çeviriler ya da kategoriler değişirse tüm site yeniden üretilir"""
+        digest = hashlib.sha1()
+        for root, dirs, files in os.walk(os.path.join(app.root_path, "templates")):
+            dirs.sort()
+            for name in sorted(files):
+                with open(os.path.join(root, name), "rb") as f:
+                    digest.update(name.encode("utf-8") + f.read())
+        digest.update(TRANSLATIONS_FINGERPRINT.encode("utf-8"))
+        digest.update(repr(sorted(COLOR_PALETTE.items())).encode("utf-8"))
+        digest.update(app.config["STATIC_EXPORT_BASE_URL"].encode("utf-8"))
+        digest.update(app.config["STATIC_EXPORT_ORIGIN_URL"].encode("utf-8"))
+        digest.update(
+            repr([(c.id, c.slug, c.icon, c.order_index) for c in categories]).encode(
+                "utf-8"
+            )
+        )
+        return digest.hexdigest()
+
+    @staticmethod
+    def mirror_fingerprint():
+        """Mirror durumu değişirse (manifest bağlantıları) tüm XPD'ler yeniden üretilir"""
+        count, last_fetch = (
+            db.session.query(
+                db.func.count(MirrorObject.id), db.func.max(MirrorObject.fetched_at)
+            )
+            .filter(MirrorObject.status == "ready")
+            .one()
+        )
+        return f"{count}:{last_fetch}"
+
+    def load_state(self):
+        try:
+            with open(
+                os.path.join(self.output, STATIC_EXPORT_STATE), encoding="utf-8"
+            ) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def run(self, full=False):
+        """Dışa aktarımı çalıştır; yenilenen sayfa sayısını döndür"""
+        state = self.load_state()
+        categories = Category.query.order_by(Category.order_index).all()
+        slugs = {category.id: category.slug for category in categories}
+        fingerprint = self.fingerprint(categories)
+        mirror_fingerprint = self.mirror_fingerprint()
+        full = full or state.get("fingerprint") != fingerprint
+        if not full:
+            self.files = set(state.get("files", ()))
+
+        # Entry -> listelendiği sayfalar; önceki dışa aktarımla karşılaştırılır
+        entries = Entry.query.all()
+        known = state.get("entries", {})
+        current = {
+            str(e.id): [slugs.get(e.category_id), e.psp_model, e.firmware_type]
+            for e in entries
+        }
+        since = state.get("cursor")
+        since = datetime.strptime(since, API_TIME_FORMAT) if since else None
+        changed = [
+            e
+            for e in entries
+            if full or since is None or e.updated_at > since or str(e.id) not in known
+        ]
+        deleted = set(known) - set(current)
+
+        pages = set()
+        if full:
+            pages.update(
+                static_page(endpoint)
+                for endpoint in ("index", "header_frame", "footer_frame", "main")
+            )
+            for category in categories:
+                pages.add(static_page("category_detail", slug=category.slug))
+                pages.add(static_page("category_feed", slug=category.slug))
+            for psp_model in FIRMWARE_MODELS:
+                pages.add(static_page("firmware_type_select", psp_model=psp_model))
+                for firmware_type in FIRMWARE_TYPES:
+                    pages.add(
+                        static_page(
+                            "firmware_detail",
+                            psp_model=psp_model,
+                            firmware_type=firmware_type,
+                        )
+                    )
+        else:
+            for key in [str(e.id) for e in changed] + sorted(deleted):
+                for membership in (known.get(key), current.get(key)):
+                    if membership and membership[0]:
+                        pages |= entry_pages(*membership)
+
+        if full:
+            manifests = entries
+        elif state.get("mirror") != mirror_fingerprint:
+            manifests = entries
+        else:
+            manifests = changed
+        stale_files = set(state.get("files", ())) if full else set()
+
+        # Manifestlerdeki /download ve /mirror bağlantıları Flask sunucusunu gösterir
+        with app.test_request_context(
+            "/", base_url=app.config["STATIC_EXPORT_ORIGIN_URL"]
+        ):
+            for endpoint, values in sorted(pages):
+                for lang in SUPPORTED_LANGUAGES:
+                    content = self.render_page(lang, endpoint, dict(values))
+                    self.write(
+                        self.page_file(lang, endpoint, dict(values)),
+                        content.encode("utf-8"),
+                    )
+
+            for entry in manifests:
+                if entry.file_path.lower().endswith(".xpd"):
+                    self.export_manifest(entry)
+                else:
+                    self.remove(f"xpd/{entry.id}.xpd")
+            for key in deleted:
+                self.remove(f"xpd/{key}.xpd")
+
+            # GitHub Pages ayarları kaynak depodan kopyalanır
+            for name in ("CNAME", ".nojekyll"):
+                if os.path.isfile(name):
+                    with open(name, "rb") as f:
+                        self.write(name, f.read())
+
+            # Şablonlardaki ve kategori ikonlarındaki /images/ yolları
+            for root, dirs, names in os.walk("images"):
+                dirs.sort()
+                for name in sorted(names):
+                    source = os.path.join(root, name)
+                    self.copy(source.replace(os.sep, "/"), source)
+
+        for relpath in stale_files - self.files:
+            self.remove(relpath)
+
+        changes = [e.updated_at for e in entries if e.updated_at]
+        cursor = max(changes) if changes else None
+        state = {
+            "fingerprint": fingerprint,
+            "mirror": self.mirror_fingerprint(),
+            "cursor": cursor.strftime(API_TIME_FORMAT) if cursor else None,
+            "entries": current,
+            "files": sorted(self.files),
+        }
+        self.write(STATIC_EXPORT_STATE, json.dumps(state).encode("utf-8"))
+        self.files.discard(STATIC_EXPORT_STATE)
+        return len(pages)
+
+
+@app.cli.command("export-static")
+@click.option("--full", is_flag=True, help="Tüm sayfaları yeniden üret")
+@click.option(
+    "--output", default=None, help="Çıktı klasörü (varsayılan STATIC_EXPORT_DIR)"
+)
+def export_static_command(full, output):
+    """Katalogu statik siteye aktar (yalnızca değişen entry'lerin sayfaları)"""
+    db.create_all()
+    exporter = StaticSiteExporter(output or app.config["STATIC_EXPORT_FOLDER"])
+    pages = exporter.run(full=full)
+    click.echo(
+        f"{pages} sayfa yenilendi: {exporter.written} dosya yazıldı, "
+        f"{exporter.unchanged} değişmedi, {exporter.removed} silindi"
+    )
+
+
 @app.route("/set_language/<lang>")
 def set_language(lang):
     response = redirect(request.referrer or url_for("index"))
@@ -891,6 +3910,14 @@ def set_language(lang):
     return response
 
 
+@app.route("/set_layout/<layout>")
+def set_layout(layout):
+    response = redirect(url_for("index"))
+    if layout in LAYOUTS:
+        response.set_cookie("layout", layout, max_age=60 * 60 * 24 * 365)  # 1 yıl
+    return response
+
+
 # Static dosyalar için route
 @app.route("/images/<path:filename>")
 def serve_images(filename):
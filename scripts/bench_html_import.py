@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+PSP Portal - Eski HTML içe aktarıcı karşılaştırması
+pdc/main.html'in satırlarını çoğaltarak sentetik bir sayfa üretir ve eski regex ile
+html.parser tabanlı extract_html_records'u süre ve bulunan satır sayısı açısından
+karşılaştırır. --variants ile bazı satırlar tarayıcıların sorunsuz gösterdiği
+biçim farklarıyla (büyük harfli etiket, href'ten önce öznitelik) yazılır.
+
+Kullanım: python3 scripts/bench_html_import.py [--scale 100] [--variants]
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app import extract_html_records, row_download  # noqa: E402
+
+# Değişiklik öncesi import_from_pdc_html'deki desen
+PDC_ROW_PATTERN = (
+    r"<tr[^>]*>.*?<td[^>]*><img[^>]+></td>.*?<td[^>]*>([^<]+)</td>.*?"
+    r'<td[^>]*>([^<]+)</td>.*?<td[^>]*><a href="([^"]+)"[^>]*>'
+)
+
+
+def build_synthetic_page(scale, variants):
+    """pdc/main.html'in satır bloğunu scale kez tekrarlayan sayfa"""
+    with open(os.path.join("pdc", "main.html"), encoding="utf-8") as f:
+        content = f.read()
+
+    first_row = content.index("<tr>", content.index("<th>"))
+    table_end = content.index("</table>", first_row)
+    rows = content[first_row:table_end]
+
+    blocks = []
+    for i in range(scale):
+        block = rows
+        if variants and i % 10 == 0:
+            block = block.replace("<td><a href=", '<td><a class="dl" href=')
+        elif variants and i % 10 == 5:
+            block = block.replace("<td>", "<TD>")
+        blocks.append(block)
+    return content[:first_row] + "".join(blocks) + content[table_end:]
+
+
+def regex_rows(path):
+    """(başlık, adres) çiftleri"""
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    rows = re.findall(PDC_ROW_PATTERN, content, re.DOTALL)
+    return [(title.strip(), url) for title, _, url in rows]
+
+
+def parser_rows(path):
+    """(başlık, adres) çiftleri"""
+    rows = []
+    for record in extract_html_records(path):
+        download = record[0] == "row" and row_download(record[1], ("",))
+        if download:
+            rows.append((download[1][0], download[0]))
+    return rows
+
+
+def measure(function, path, runs):
+    best = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = function(path)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scale", type=int, default=100)
+    parser.add_argument("--variants", action="store_true")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    page = build_synthetic_page(args.scale, args.variants)
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".html", encoding="utf-8", delete=False
+    ) as f:
+        f.write(page)
+    try:
+        print(f"Sentetik sayfa: {len(page) / 1024:.0f} KB, {args.scale}x pdc/main.html")
+        # Başlığı ile adresi orijinal sayfada aynı satırda olmayan çiftler hatalıdır
+        # (iki yöntem de orijinal sayfada aynı 135 satırı bulur)
+        expected = set(parser_rows(os.path.join("pdc", "main.html")))
+        for name, function in (("regex", regex_rows), ("html.parser", parser_rows)):
+            elapsed, rows = measure(function, f.name, args.runs)
+            wrong = sum(
+                1
+                for title, url in rows
+                if (title.replace("&amp;", "&"), url) not in expected
+            )
+            print(
+                f"{name:12} {elapsed * 1000:8.1f} ms  {len(rows):6} satır  {wrong:5} hatalı"
+            )
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+PSP Portal - Çerçeveli ve tek sayfa düzenlerinin sayfa tamamlanma süresi
+PSP tarayıcısını taklit eder: belgeyi alır, içindeki frame ve img kaynaklarını
+sınırlı sayıda bağlantıyla indirir. Her istek gecikme (RTT) ve paylaşılan
+Wi-Fi bant genişliği kadar bekletilir.
+
+Kullanım: python3 scripts/bench_layout.py [--rtt 150] [--bandwidth 200] [--connections 2]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from app import app  # noqa: E402
+
+
+class ResourceParser(HTMLParser):
+    """Belgedeki frame ve görsel kaynaklarını topla"""
+
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+        self.images = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "frame" and attrs.get("src"):
+            self.frames.append(attrs["src"])
+        elif tag == "img" and attrs.get("src"):
+            self.images.append(attrs["src"])
+
+
+class SimulatedBrowser:
+    def __init__(self, rtt, bandwidth, connections):
+        self.rtt = rtt
+        self.bandwidth = bandwidth
+        self.connections = connections
+        self.link = threading.Lock()  # Tek Wi-Fi bağlantısı paylaşılır
+        self.requests = 0
+        self.bytes = 0
+        self.server_time = 0.0
+        self.stats_lock = threading.Lock()
+
+    def fetch(self, url):
+        client = app.test_client()
+        started = time.perf_counter()
+        data = client.get(url).data
+        elapsed = time.perf_counter() - started
+
+        time.sleep(self.rtt)
+        with self.link:
+            time.sleep(len(data) / self.bandwidth)
+
+        with self.stats_lock:
+            self.requests += 1
+            self.bytes += len(data)
+            self.server_time += elapsed
+        return data
+
+    def load(self, url):
+        """Sayfayı tüm çerçeve ve görselleriyle yükle; geçen süreyi döndür"""
+        seen = set()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(self.connections) as pool:
+            documents = [url]
+            while documents:
+                seen.update(documents)
+                images = []
+                frames = []
+                for doc_url, data in zip(documents, pool.map(self.fetch, documents)):
+                    parser = ResourceParser()
+                    parser.feed(data.decode("utf-8", "replace"))
+                    frames += [urljoin(doc_url, src) for src in parser.frames]
+                    images += [urljoin(doc_url, src) for src in parser.images]
+
+                # Görseller ve alt çerçeveler aynı bağlantı havuzunu paylaşır
+                images = [src for src in dict.fromkeys(images) if src not in seen]
+                seen.update(images)
+                documents = [src for src in dict.fromkeys(frames) if src not in seen]
+                list(pool.map(self.fetch, images))
+        return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rtt", type=float, default=150, help="Gecikme (ms)")
+    parser.add_argument(
+        "--bandwidth", type=float, default=200, help="Bant genişliği (KB/sn)"
+    )
+    parser.add_argument("--connections", type=int, default=2)
+    parser.add_argument("--lang", default="tr")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    # Çerçeveli düzende kategoriye geçiş yalnızca main çerçevesini yeniler
+    pages = {
+        "ana sayfa": "/",
+        "kategori": "/category/plugins",
+    }
+    print(
+        f"RTT {args.rtt:.0f} ms, {args.bandwidth:.0f} KB/sn, {args.connections} bağlantı"
+    )
+    for name, path in pages.items():
+        for layout in ("frames", "single"):
+            url = f"http://localhost{path}?lang={args.lang}&layout={layout}"
+            results = []
+            for _ in range(args.runs):
+                browser = SimulatedBrowser(
+                    args.rtt / 1000, args.bandwidth * 1024, args.connections
+                )
+                results.append((browser.load(url), browser))
+            total, browser = min(results, key=lambda result: result[0])
+            print(
+                f"{name:10} {layout:7} {total * 1000:7.0f} ms  "
+                f"{browser.requests:3} istek  {browser.bytes / 1024:6.1f} KB  "
+                f"sunucu {browser.server_time * 1000:5.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()